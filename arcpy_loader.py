@@ -0,0 +1,34 @@
+"""
+Lazy arcpy loader shared by the utility modules
+
+Importing arcpy takes several seconds and loads a large native footprint.
+Modules that are imported only for configuration or email code paths
+should not pay that cost, so the proxy defers the real import until the
+first arcpy attribute is actually accessed. Usage:
+
+    from arcpy_loader import arcpy
+"""
+
+
+class _LazyArcpy:
+    _module = None
+
+    def _load(self):
+        if _LazyArcpy._module is None:
+            import arcpy as real_arcpy
+            # Shared environment tuning, applied exactly once on first use:
+            # let geoprocessing tools use every core, skip exists-checks on
+            # outputs, and batch GDB commits instead of fsyncing per row
+            real_arcpy.env.parallelProcessingFactor = "100%"
+            real_arcpy.env.overwriteOutput = True
+            real_arcpy.env.autoCommit = 10000
+            real_arcpy.env.workspace = real_arcpy.env.scratchGDB
+            real_arcpy.SetLogHistory(False)
+            _LazyArcpy._module = real_arcpy
+        return _LazyArcpy._module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+
+arcpy = _LazyArcpy()
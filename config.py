@@ -33,6 +33,17 @@ COMPARISON_GDB = "comparison"
 # SDE connection
 SDE_PATH = r"C:\Users\yagelm\AppData\Roaming\ESRI\ArcGISPro\Favorites\gis-postgres03.sde"
 
+# Optional PostgreSQL view that already carries merchav_string and oid_1
+# as derived columns (see the converter's _create_enriched_view). When set,
+# the export reads the view directly and the per-row enrichment pipeline
+# is skipped. Leave empty to derive the columns client-side.
+ENRICHED_VIEW = ""
+
+# Optional direct PostgreSQL DSN for the COPY-based bulk export path
+# (e.g. "host=gis-postgres03 dbname=gis user=... password=...").
+# Leave empty to always export through the SDE connection.
+PG_DSN = ""
+
 # Email settings
 EMAIL_GROUP = ["yagel@me.com"]
 
@@ -1,40 +1,184 @@
 """
 Database utilities for PostgreSQL connection and data export
 """
-import arcpy
+from arcpy_loader import arcpy
 import logging
-from config import SDE_PATH
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from config import SDE_PATH, COLUMNS_FILTER, PG_DSN
+from gdb_utils import _fgdb_exists, _invalidate_metadata_cache, _list_field_names_cached
 
 class DatabaseManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
-    def export_table_to_gdb(self, gdb_path, table_name):
+        self._schema_cache = {}
+        self._pool = None
+
+    def _get_pool(self):
+        """
+        Lazily create the shared psycopg2 connection pool
+
+        Connecting pays TCP + TLS + auth latency every time; the pool is
+        built once and connections are borrowed per query, so repeated
+        exports and schema lookups reuse live sessions. TCP keepalives
+        stop NAT from dropping the connection while long arcpy steps run
+        between queries.
+
+        Returns:
+            psycopg2.pool.ThreadedConnectionPool: The shared pool
+        """
+        if self._pool is None:
+            from psycopg2 import pool
+
+            if not PG_DSN:
+                raise RuntimeError("PG_DSN is not configured")
+            self._pool = pool.ThreadedConnectionPool(
+                1, 4, dsn=PG_DSN,
+                keepalives=1, keepalives_idle=30, keepalives_interval=10,
+                application_name="pg2dwg",
+            )
+        return self._pool
+
+    @contextmanager
+    def conn(self):
+        """
+        Borrow a pooled connection, committing on success
+
+        Yields:
+            psycopg2 connection borrowed from the pool
+        """
+        pool = self._get_pool()
+        connection = pool.getconn()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            pool.putconn(connection)
+
+    def _export_via_copy(self, gdb_path, table_name, where_clause=None):
+        """
+        Stream the table out of PostgreSQL with COPY and bulk-load the GDB
+
+        COPY streams the whole result in one protocol exchange instead of
+        per-row round-trips; the stream lands in a local temp CSV which
+        ogr2ogr bulk-loads into the file GDB. Raises when psycopg2,
+        config.PG_DSN or ogr2ogr are unavailable so the caller can fall
+        back to the SDE export path.
+
+        Args:
+            gdb_path (str): Path to the target GDB
+            table_name (str): Name of the table to export
+            where_clause (str): Optional filter pushed down to the database
+        """
+        if not PG_DSN:
+            raise RuntimeError("PG_DSN is not configured")
+        if shutil.which("ogr2ogr") is None:
+            raise RuntimeError("ogr2ogr is not available")
+
+        columns = ", ".join(COLUMNS_FILTER)
+        query = f"SELECT ST_AsText(shape) AS wkt, {columns} FROM {table_name}"
+        if where_clause:
+            query += f" WHERE {where_clause}"
+
+        tmp = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", delete=False, newline="", encoding="utf-8"
+        )
+        try:
+            with self.conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY ({query}) TO STDOUT WITH (FORMAT CSV, HEADER)", tmp
+                    )
+                # WKT carries no SRS, so read the SRID from the source
+                # geometry and stamp it onto the loaded feature class
+                with conn.cursor() as cursor:
+                    cursor.execute(f"SELECT ST_SRID(shape) FROM {table_name} LIMIT 1")
+                    row = cursor.fetchone()
+                    srid = row[0] if row else 0
+            tmp.close()
+
+            self.logger.info(f"COPY stream complete, bulk-loading {table_name} into {gdb_path}")
+            # -update -overwrite: the caller creates the GDB up front, and
+            # ogr2ogr refuses to write into an existing datasource without
+            # them (replacing any previous layer of the same name)
+            command = [
+                "ogr2ogr", "-f", "OpenFileGDB", gdb_path, tmp.name,
+                "-nln", table_name,
+                "-update", "-overwrite",
+                "-oo", "GEOM_POSSIBLE_NAMES=wkt",
+                "-oo", "AUTODETECT_TYPE=YES",
+            ]
+            if srid:
+                command += ["-a_srs", f"EPSG:{srid}"]
+            subprocess.run(command, check=True)
+        finally:
+            tmp.close()
+            os.unlink(tmp.name)
+
+    def export_table_to_gdb(self, gdb_path, table_name, where_clause=None):
         """
         Export PostgreSQL table to File Geodatabase
-        
+
         Args:
             gdb_path (str): Path to the target GDB
             table_name (str): Name of the table to export
+            where_clause (str): Optional filter pushed down to the database
         """
         try:
             # Create the GDB if it doesn't exist
-            if not arcpy.Exists(gdb_path):
-                import os
+            if not _fgdb_exists(gdb_path):
                 gdb_folder = os.path.dirname(gdb_path)
                 gdb_name = os.path.basename(gdb_path)
                 arcpy.CreateFileGDB_management(gdb_folder, gdb_name)
                 self.logger.info(f"Created GDB: {gdb_path}")
             
             # Set up the input feature class path
-            input_fc = f"{SDE_PATH}\\{table_name}"
+            input_fc = os.path.join(SDE_PATH, table_name)
             
             # Export the feature class to GDB
-            output_fc = f"{gdb_path}\\{table_name}"
+            output_fc = os.path.join(gdb_path, table_name)
             
             self.logger.info(f"Exporting {input_fc} to {output_fc}")
-            arcpy.CopyFeatures_management(input_fc, output_fc)
-            
+
+            # Prefer the COPY streaming path when a direct DSN is configured
+            if PG_DSN:
+                try:
+                    self._export_via_copy(gdb_path, table_name, where_clause)
+                    _invalidate_metadata_cache(output_fc)
+                    self.logger.info(f"Successfully exported {table_name} to {gdb_path} via COPY")
+                    return
+                except Exception as copy_error:
+                    self.logger.warning(f"COPY export failed, falling back to SDE export: {copy_error}")
+
+            # Push the column subset (and optional filter) down to the
+            # database instead of copying every column over the wire
+            field_mappings = arcpy.FieldMappings()
+            for field_name in COLUMNS_FILTER:
+                try:
+                    field_map = arcpy.FieldMap()
+                    field_map.addInputField(input_fc, field_name)
+                    field_mappings.addFieldMap(field_map)
+                except Exception:
+                    self.logger.warning(f"Column {field_name} not found in {table_name}, skipping")
+
+            arcpy.conversion.FeatureClassToFeatureClass(
+                input_fc,
+                gdb_path,
+                table_name,
+                where_clause=where_clause,
+                field_mapping=field_mappings
+            )
+
+            # The export may have replaced an earlier copy at output_fc;
+            # drop metadata cached for the old contents
+            _invalidate_metadata_cache(output_fc)
+
             self.logger.info(f"Successfully exported {table_name} to {gdb_path}")
             
         except Exception as e:
@@ -43,22 +187,57 @@ class DatabaseManager:
             
     def get_table_schema(self, table_name):
         """
-        Get the schema of a PostgreSQL table
-        
+        Get the schema of a PostgreSQL table (cached per run)
+
+        The schema is needed by the export, the merchav enrichment and the
+        comparison steps; it is reflected once per table and served from
+        the cache afterwards. With a direct DSN configured, a single
+        information_schema query replaces the per-field metadata chatter.
+
         Args:
             table_name (str): Name of the table
-            
+
         Returns:
             list: List of field names
         """
         try:
-            input_fc = f"{SDE_PATH}\\{table_name}"
-            fields = arcpy.ListFields(input_fc)
-            field_names = [field.name for field in fields]
-            
+            if table_name in self._schema_cache:
+                return list(self._schema_cache[table_name])
+
+            field_names = None
+            if PG_DSN:
+                try:
+                    field_names = self._query_schema_from_pg(table_name)
+                except Exception as pg_error:
+                    self.logger.warning(f"Direct schema query failed, using SDE: {pg_error}")
+
+            if field_names is None:
+                input_fc = os.path.join(SDE_PATH, table_name)
+                field_names = list(_list_field_names_cached(input_fc))
+
+            self._schema_cache[table_name] = tuple(field_names)
             self.logger.info(f"Table {table_name} schema: {field_names}")
             return field_names
-            
+
         except Exception as e:
             self.logger.error(f"Error getting schema for table {table_name}: {str(e)}")
             raise
+
+    def _query_schema_from_pg(self, table_name):
+        """
+        Fetch the column list with one information_schema query
+
+        Args:
+            table_name (str): Name of the table
+
+        Returns:
+            list: List of column names in ordinal order
+        """
+        with self.conn() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_name = %s ORDER BY ordinal_position",
+                    (table_name,)
+                )
+                return [row[0] for row in cursor.fetchall()]
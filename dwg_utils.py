@@ -1,9 +1,31 @@
 """
 DWG utilities for converting between GDB and DWG formats
 """
-import arcpy
+from arcpy_loader import arcpy
 import logging
 import os
+import shutil
+import subprocess
+from gdb_utils import _fgdb_exists
+
+
+def _merchav_case_sql(merchav_mapping):
+    """
+    Build the CASE expression that maps merchav codes to strings in SQL
+
+    Generated once from the mapping so the enrichment runs inside the
+    database query instead of as a separate arcpy field calculation.
+
+    Args:
+        merchav_mapping (dict): Mapping of merchav codes to strings
+
+    Returns:
+        str: A "CASE merchav WHEN ... END" SQL expression
+    """
+    whens = " ".join(
+        f"WHEN {code} THEN '{name}'" for code, name in sorted(merchav_mapping.items())
+    )
+    return f"CASE merchav {whens} END"
 
 class DWGManager:
     def __init__(self):
@@ -23,20 +45,14 @@ class DWGManager:
             os.makedirs(os.path.dirname(dwg_path), exist_ok=True)
             
             # Set up paths
-            input_fc = f"{gdb_path}\\{table_name}"
+            input_fc = os.path.join(gdb_path, table_name)
             output_dwg = dwg_path
             
             if not arcpy.Exists(input_fc):
                 raise ValueError(f"Feature class {input_fc} does not exist")
             
-            # Delete existing DWG file if it exists
-            if os.path.exists(output_dwg):
-                try:
-                    os.remove(output_dwg)
-                    self.logger.info(f"Deleted existing DWG file: {output_dwg}")
-                except Exception as delete_error:
-                    self.logger.warning(f"Could not delete existing DWG file: {delete_error}")
-            
+            # arcpy.env.overwriteOutput (set in arcpy_loader) replaces the
+            # existing DWG, so no manual delete is needed
             self.logger.info(f"Converting {input_fc} to DWG: {output_dwg}")
             
             # Convert to DWG using ExportCAD (ArcGIS Pro function)
@@ -56,6 +72,53 @@ class DWGManager:
             self.logger.error(f"Error converting GDB to DWG: {str(e)}")
             raise
             
+    def direct_pg_to_dwg(self, pg_conn_str, table_name, merchav_mapping, dwg_path):
+        """
+        Stream a PostgreSQL table straight into a DWG with ogr2ogr
+
+        Skips the intermediate GDB export and the arcpy merchav enrichment:
+        one ogr2ogr invocation reads the table over a direct connection,
+        computes merchav_string with a CASE expression inside the query and
+        writes the DWG. Raises when ogr2ogr or its DWG driver is missing so
+        the caller can fall back to the GDB pipeline.
+
+        Args:
+            pg_conn_str (str): libpq connection string (config.PG_DSN)
+            table_name (str): Name of the table to export
+            merchav_mapping (dict): Mapping of merchav codes to strings
+            dwg_path (str): Path to the output DWG file
+        """
+        try:
+            if not pg_conn_str:
+                raise RuntimeError("PG_DSN is not configured")
+            if shutil.which("ogr2ogr") is None:
+                raise RuntimeError("ogr2ogr is not available")
+
+            os.makedirs(os.path.dirname(dwg_path), exist_ok=True)
+
+            case_sql = _merchav_case_sql(merchav_mapping)
+            sql = f"SELECT *, {case_sql} AS merchav_string FROM {table_name}"
+
+            self.logger.info(f"Streaming {table_name} directly to DWG: {dwg_path}")
+            subprocess.run(
+                [
+                    "ogr2ogr", "-f", "AutoCAD DWG", dwg_path,
+                    f"PG:{pg_conn_str}", "-sql", sql, "-overwrite",
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+
+            self.logger.info(f"Successfully streamed {table_name} to DWG: {dwg_path}")
+
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"ogr2ogr PG to DWG export failed: {e.stderr}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error streaming PG to DWG: {str(e)}")
+            raise
+
     def convert_dwg_to_gdb(self, dwg_path, gdb_path, table_name):
         """
         Convert a DWG file to GDB format for comparison
@@ -70,13 +133,13 @@ class DWGManager:
                 raise ValueError(f"DWG file {dwg_path} does not exist")
             
             # Create the GDB if it doesn't exist
-            if not arcpy.Exists(gdb_path):
+            if not _fgdb_exists(gdb_path):
                 gdb_dir = os.path.dirname(gdb_path)
                 gdb_name = os.path.basename(gdb_path)
                 arcpy.CreateFileGDB_management(gdb_dir, gdb_name)
             
             # Set up output path
-            output_fc = f"{gdb_path}\\{table_name}"
+            output_fc = os.path.join(gdb_path, table_name)
             
             self.logger.info(f"Converting DWG {dwg_path} to GDB: {output_fc}")
             
@@ -93,7 +156,7 @@ class DWGManager:
             imported_fcs = arcpy.ListFeatureClasses(feature_dataset=None, feature_type="")
             if imported_fcs:
                 # Use the first imported feature class
-                imported_fc = f"{gdb_path}\\{imported_fcs[0]}"
+                imported_fc = os.path.join(gdb_path, imported_fcs[0])
                 if imported_fc != output_fc:
                     arcpy.Rename_management(imported_fc, table_name)
             
@@ -113,7 +176,11 @@ class DWGManager:
         Returns:
             bool: True if file exists, False otherwise
         """
-        return os.path.exists(dwg_path)
+        try:
+            os.stat(dwg_path)
+            return True
+        except OSError:
+            return False
         
     def get_dwg_info(self, dwg_path):
         """
@@ -126,17 +193,19 @@ class DWGManager:
             dict: Information about the DWG file
         """
         try:
-            if not self.dwg_exists(dwg_path):
+            # One stat() syscall instead of separate exists/getsize/getmtime
+            # round-trips - significant over a UNC network path
+            try:
+                st = os.stat(dwg_path)
+            except FileNotFoundError:
                 return {"exists": False}
-            
-            file_info = {
+
+            return {
                 "exists": True,
-                "size": os.path.getsize(dwg_path),
-                "modified": os.path.getmtime(dwg_path)
+                "size": st.st_size,
+                "modified": st.st_mtime
             }
-            
-            return file_info
-            
+
         except Exception as e:
             self.logger.error(f"Error getting DWG info: {str(e)}")
             return {"exists": False, "error": str(e)}
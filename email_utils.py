@@ -0,0 +1,111 @@
+"""
+Email utilities for sending notification emails about conversion results
+"""
+import atexit
+import logging
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from config import SMTP_SERVER, SMTP_PORT, SMTP_USER, SMTP_PASSWORD
+
+class EmailNotifier:
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+        # Single worker keeps sends ordered and the SMTP connection
+        # confined to one thread
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        atexit.register(self.close)
+
+    def _get_server(self):
+        """
+        Return a connected SMTP server, reusing the existing connection
+
+        The TLS handshake + AUTH costs hundreds of ms per connect, so the
+        connection is opened once and kept for the whole run. A NOOP probe
+        detects dropped connections and triggers a reconnect.
+
+        Returns:
+            smtplib.SMTP: Connected and authenticated SMTP server
+        """
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+        # Bounded timeout so a dead SMTP server can't stall the sender
+        # thread (and the atexit flush) indefinitely
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=5)
+        server.starttls()
+        server.login(SMTP_USER, SMTP_PASSWORD)
+        self._server = server
+        self.logger.info(f"Connected to SMTP server: {SMTP_SERVER}:{SMTP_PORT}")
+        return self._server
+
+    def send_email(self, to_addresses, subject, body):
+        """
+        Queue a notification email on the background sender thread
+
+        Emails are best-effort notifications, so the pipeline should not
+        block on the SMTP round-trip; the actual send happens on the
+        worker thread.
+
+        Args:
+            to_addresses (list): List of recipient addresses
+            subject (str): Email subject
+            body (str): Email body text
+        """
+        self._pool.submit(self._send_sync, to_addresses, subject, body)
+
+    def _send_sync(self, to_addresses, subject, body):
+        """
+        Send a notification email, reusing the persistent SMTP connection
+
+        Args:
+            to_addresses (list): List of recipient addresses
+            subject (str): Email subject
+            body (str): Email body text
+        """
+        try:
+            message = MIMEMultipart()
+            message["From"] = SMTP_USER
+            message["To"] = ", ".join(to_addresses)
+            message["Subject"] = subject
+            message.attach(MIMEText(body, "plain"))
+
+            server = self._get_server()
+            server.sendmail(SMTP_USER, to_addresses, message.as_string())
+
+            self.logger.info(f"Email sent to {to_addresses}: {subject}")
+
+        except Exception as e:
+            self.logger.error(f"Error sending email: {str(e)}")
+            raise
+
+    def test_email_connection(self):
+        """
+        Test that the SMTP server is reachable and credentials work
+
+        Returns:
+            bool: True if the connection works, False otherwise
+        """
+        try:
+            self._get_server()
+            return True
+        except Exception as e:
+            self.logger.error(f"Email connection test failed: {str(e)}")
+            return False
+
+    def close(self):
+        """Flush queued emails and close the persistent SMTP connection"""
+        self._pool.shutdown(wait=True)
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
@@ -1,14 +1,73 @@
 """
 Geodatabase utilities for managing File Geodatabases
 """
-import arcpy
+from arcpy_loader import arcpy
+import functools
 import logging
 import os
+import numpy as np
+
+
+@functools.lru_cache(maxsize=64)
+def _describe_cached(path):
+    """Cached arcpy.Describe - metadata round-trips are expensive on GDB/SDE"""
+    return arcpy.Describe(path)
+
+
+@functools.lru_cache(maxsize=64)
+def _list_field_names_cached(path):
+    """Cached field-name listing for a table/feature class path"""
+    return tuple(field.name for field in arcpy.ListFields(path))
+
+
+@functools.lru_cache(maxsize=64)
+def _field_name_set_cached(path):
+    """Cached frozenset of field names for O(1) membership tests"""
+    return frozenset(_list_field_names_cached(path))
+
+
+def _fgdb_exists(gdb_path):
+    """
+    Cheap existence check for a File Geodatabase
+
+    A file GDB is just a .gdb directory, so a single stat call replaces the
+    much heavier arcpy.Exists catalog lookup. Only valid for file GDB paths,
+    not for feature classes inside one.
+
+    Args:
+        gdb_path (str): Path to the .gdb folder
+
+    Returns:
+        bool: True if the GDB folder exists, False otherwise
+    """
+    return gdb_path.endswith(".gdb") and os.path.isdir(gdb_path)
+
+
+def _invalidate_metadata_cache(path=None):
+    """
+    Invalidate cached Describe/ListFields/count results after dataset changes
+
+    Must be called whenever a GDB is deleted or re-exported: in a long-lived
+    scheduler-loop process the curr/prev GDBs are recreated at the same
+    paths, and path-keyed entries would otherwise describe the old contents.
+
+    Args:
+        path (str): Ignored (lru_cache has no per-key eviction); kept for clarity
+    """
+    _describe_cached.cache_clear()
+    _list_field_names_cached.cache_clear()
+    _field_name_set_cached.cache_clear()
+    GDBManager._count_cache.clear()
+
 
 class GDBManager:
+    # Shared across instances so _invalidate_metadata_cache can evict
+    # counts when a GDB is deleted or re-exported at the same path
+    _count_cache = {}
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
+
     def create_gdb(self, gdb_path):
         """
         Create a new File Geodatabase
@@ -17,7 +76,7 @@ class GDBManager:
             gdb_path (str): Path to the GDB to create
         """
         try:
-            if arcpy.Exists(gdb_path):
+            if _fgdb_exists(gdb_path):
                 self.logger.warning(f"GDB {gdb_path} already exists")
                 return
                 
@@ -39,24 +98,35 @@ class GDBManager:
             gdb_path (str): Path to the GDB to delete
         """
         try:
-            if arcpy.Exists(gdb_path):
-                # Try to delete with a small delay to handle locking issues
-                import time
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        arcpy.Delete_management(gdb_path)
-                        self.logger.info(f"Deleted GDB: {gdb_path}")
-                        return
-                    except Exception as delete_error:
-                        if attempt < max_retries - 1:
-                            self.logger.warning(f"Attempt {attempt + 1} failed to delete GDB, retrying in 2 seconds...")
-                            time.sleep(2)
-                        else:
-                            raise delete_error
+            if _fgdb_exists(gdb_path):
+                # Release lingering locks up front instead of sleeping and
+                # retrying: drop cursor handles via gc, detach the workspace
+                # and clear arcpy's workspace cache
+                import gc
+                gc.collect()
+                arcpy.env.workspace = None
+                try:
+                    arcpy.ClearWorkspaceCache_management(gdb_path)
+                except Exception:
+                    pass
+
+                try:
+                    arcpy.Delete_management(gdb_path)
+                    self.logger.info(f"Deleted GDB: {gdb_path}")
+                except Exception as delete_error:
+                    # File GDBs are plain directories - remove directly
+                    if gdb_path.endswith(".gdb") and os.path.isdir(gdb_path):
+                        import shutil
+                        shutil.rmtree(gdb_path, ignore_errors=True)
+                        self.logger.info(f"Deleted GDB via rmtree: {gdb_path}")
+                    else:
+                        raise delete_error
+                # Anything cached for paths inside this GDB now describes
+                # deleted data; a re-export will recreate the same paths
+                _invalidate_metadata_cache(gdb_path)
             else:
                 self.logger.warning(f"GDB {gdb_path} does not exist")
-                
+
         except Exception as e:
             self.logger.error(f"Error deleting GDB {gdb_path}: {str(e)}")
             # Don't raise the exception to avoid stopping the main process
@@ -72,7 +142,7 @@ class GDBManager:
             merchav_mapping (dict): Mapping of merchav codes to strings
         """
         try:
-            table_path = f"{gdb_path}\\{table_name}"
+            table_path = os.path.join(gdb_path, table_name)
             
             if not arcpy.Exists(table_path):
                 raise ValueError(f"Table {table_path} does not exist")
@@ -81,37 +151,65 @@ class GDBManager:
             field_name = "merchav_string"
             if not self.field_exists(table_path, field_name):
                 arcpy.AddField_management(table_path, field_name, "TEXT", field_length=50)
+                _invalidate_metadata_cache(table_path)
                 self.logger.info(f"Added field {field_name} to {table_name}")
             
-            # Start an edit session
+            # Only touch rows that still need a value - on incremental runs
+            # the work scales with the delta instead of the full table
+            where_clause = "merchav_string IS NULL OR merchav_string = ''"
+
+            # Vectorize the mapping: pull OIDs and codes into one numpy
+            # array, resolve the codes against the sorted key table with
+            # searchsorted, then write the results back in a single cursor
+            # pass / commit, keyed on OID so the read and write scans
+            # cannot misalign
+            self.logger.info("Updating merchav_string values")
+            arr = arcpy.da.TableToNumPyArray(
+                table_path, ["OID@", "merchav"], where_clause=where_clause,
+                skip_nulls=False, null_value=-1
+            )
+            codes = arr["merchav"]
+            if codes.size == 0:
+                self.logger.info("No rows need a merchav_string value")
+                return
+
+            keys = np.fromiter(sorted(merchav_mapping), dtype=np.int64, count=len(merchav_mapping))
+            values = np.array([merchav_mapping[key] for key in sorted(merchav_mapping)])
+
+            indices = np.clip(np.searchsorted(keys, codes), 0, len(keys) - 1)
+            matched = keys[indices] == codes
+
+            mapped = values[indices].astype(object)
+            if not matched.all():
+                unmatched = ~matched
+                # -1 is the null sentinel from TableToNumPyArray; keep the
+                # baseline's "Unknown_None" spelling for NULL codes
+                mapped[unmatched] = [
+                    "Unknown_None" if code == -1 else f"Unknown_{code}"
+                    for code in codes[unmatched]
+                ]
+
+            values_by_oid = dict(zip(arr["OID@"].tolist(), mapped))
+
+            # One edit session = one commit for the whole batch
             edit = arcpy.da.Editor(gdb_path)
             edit.startEditing(False, True)
             edit.startOperation()
-            
             try:
-                # Update the field values based on merchav mapping
-                self.logger.info("Updating merchav_string values")
-                with arcpy.da.UpdateCursor(table_path, ["merchav", "merchav_string"]) as cursor:
-                    for row in cursor:
-                        merchav_code = row[0]
-                        if merchav_code in merchav_mapping:
-                            row[1] = merchav_mapping[merchav_code]
-                        else:
-                            row[1] = f"Unknown_{merchav_code}"
-                        cursor.updateRow(row)
-                
-                # Stop the operation and save edits
+                with arcpy.da.UpdateCursor(table_path, ["OID@", field_name], where_clause=where_clause) as cursor:
+                    for oid, _ in cursor:
+                        value = values_by_oid.get(oid)
+                        if value is not None:
+                            cursor.updateRow((oid, value))
                 edit.stopOperation()
                 edit.stopEditing(True)
-                
-                self.logger.info("Successfully updated merchav_string values")
-                
-            except Exception as e:
-                # If there's an error, abort the operation
+            except Exception:
                 edit.stopOperation()
                 edit.stopEditing(False)
-                raise e
-            
+                raise
+
+            self.logger.info("Successfully updated merchav_string values")
+
         except Exception as e:
             self.logger.error(f"Error adding merchav_string column: {str(e)}")
             raise
@@ -128,9 +226,7 @@ class GDBManager:
             bool: True if field exists, False otherwise
         """
         try:
-            fields = arcpy.ListFields(table_path)
-            field_names = [field.name for field in fields]
-            return field_name in field_names
+            return field_name in _field_name_set_cached(table_path)
         except Exception as e:
             self.logger.error(f"Error checking field existence: {str(e)}")
             return False
@@ -147,13 +243,22 @@ class GDBManager:
             int: Number of features
         """
         try:
-            table_path = f"{gdb_path}\\{table_name}"
+            table_path = os.path.join(gdb_path, table_name)
+            if table_path in self._count_cache:
+                return self._count_cache[table_path]
+
             if not arcpy.Exists(table_path):
                 return 0
-                
-            count = arcpy.GetCount_management(table_path)
-            return int(count.getOutput(0))
-            
+
+            # Count over an OID-only cursor instead of spawning a GetCount
+            # geoprocessing tool invocation per call
+            oid_field = _describe_cached(table_path).OIDFieldName
+            with arcpy.da.SearchCursor(table_path, [oid_field]) as cursor:
+                count = sum(1 for _ in cursor)
+
+            self._count_cache[table_path] = count
+            return count
+
         except Exception as e:
             self.logger.error(f"Error getting feature count: {str(e)}")
             return 0
@@ -3,65 +3,254 @@ PostgreSQL to DWG Converter
 Converts PostGIS table to DWG format with comparison and update detection
 """
 
-import arcpy, json
+import hashlib
+import json
+import atexit
+import itertools
 import os
+import queue
+import shutil
+import struct
 import sys
 import logging
+import logging.handlers
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from arcpy_loader import arcpy
 from config import *
 
 
-def _to_2d(geom: arcpy.Geometry) -> arcpy.Geometry:
-    """Return a 2D version of the geometry (drops Z and M) preserving SR."""
-    j = json.loads(geom.JSON)
+def _to_2d(geom: "arcpy.Geometry", cache: dict = None) -> "arcpy.Geometry":
+    """Return a 2D version of the geometry (drops Z and M) preserving SR.
 
-    # Drop Z/M flags
-    j['hasZ'] = False
-    j['hasM'] = False
+    Rebuilds the polygon directly from its parts with arcpy.Array/Point
+    instead of a JSON serialize + two parses per call - this runs twice
+    per compared OID, so the string work adds up linearly with vertex
+    count. An optional cache dict (keyed on the geometry's identity)
+    lets a comparison loop reuse already-converted geometries - only
+    for geometries the caller keeps alive for the cache's lifetime:
+    id() values of dead objects get recycled, so caching ephemeral
+    cursor rows would hand back another row's geometry.
+    """
+    if cache is not None:
+        cached = cache.get(id(geom))
+        if cached is not None:
+            return cached
 
-    def strip_zm_coords(seq):
-        # seq is a list of coordinates: [x,y] or [x,y,z] or [x,y,z,m]
-        return [c[:2] for c in seq]
+    parts = arcpy.Array()
+    for i in range(geom.partCount):
+        # None entries separate exterior rings from holes; keep real points
+        parts.add(arcpy.Array([arcpy.Point(pt.X, pt.Y) for pt in geom.getPart(i) if pt]))
+    flat = arcpy.Polygon(parts, geom.spatialReference)
+
+    if cache is not None:
+        cache[id(geom)] = flat
+    return flat
+
+def _wkb2d(geom: "arcpy.Geometry") -> bytes:
+    """Pack a polygon's XY coordinates as canonical little-endian WKB bytes.
+
+    Reduces geometry equality to a C-level bytes comparison instead of a
+    full topological test per OID pair. Byte equality is stricter than
+    topological equality, but identical geometries - the common case in
+    change detection - short-circuit at memcmp speed.
+    """
+    rings = []
+    for i in range(geom.partCount):
+        ring = []
+        # None entries separate the exterior ring from interior holes
+        for pt in geom.getPart(i):
+            if pt is None:
+                if ring:
+                    rings.append(ring)
+                ring = []
+            else:
+                ring.append((pt.X, pt.Y))
+        if ring:
+            rings.append(ring)
+
+    out = [struct.pack("<BII", 1, 3, len(rings))]
+    for ring in rings:
+        out.append(struct.pack("<I", len(ring)))
+        out.append(struct.pack(f"<{2 * len(ring)}d", *itertools.chain.from_iterable(ring)))
+    return b"".join(out)
+
+
+def _geom_key(geom: "arcpy.Geometry") -> bytes:
+    """16-byte digest of a geometry's XY WKB for equality keying.
+
+    Hashing the packed vertex bytes keeps the per-OID comparison a fixed
+    16-byte memcmp and stops the compare maps from holding every
+    geometry's full coordinate buffer in memory.
+    """
+    return hashlib.blake2b(_wkb2d(geom), digest_size=16).digest()
+
+
+def _oid_where_clause(oid_field, oids):
+    """Build a compact WHERE clause selecting the given OIDs.
+
+    Sorted OIDs are grouped into consecutive runs and emitted as BETWEEN
+    ranges - a handful of range scans parses and plans far cheaper on SDE
+    than a thousands-long IN list. Isolated OIDs still come out as IN.
+    None entries are dropped: DWG rows written by older exports can carry
+    a NULL Oid_1, and those have no counterpart to select anyway.
+    """
+    oids = sorted(oid for oid in oids if oid is not None)
+    ranges = []
+    singles = []
+    for _, run in itertools.groupby(enumerate(oids), lambda pair: pair[1] - pair[0]):
+        run = [oid for _, oid in run]
+        if len(run) > 1:
+            ranges.append(f"{oid_field} BETWEEN {run[0]} AND {run[-1]}")
+        else:
+            singles.append(run[0])
+    if singles:
+        ranges.append(f"{oid_field} IN ({','.join(map(str, singles))})")
+    return " OR ".join(ranges)
+
+
+# Create the log directory once at import time; repeated converter
+# constructions in one process (scheduler loop) skip the makedirs syscalls
+os.makedirs(LOG_PATH, exist_ok=True)
+
+
+class _BufferedLogHandler(logging.StreamHandler):
+    """StreamHandler that trusts the stream's own write buffer
+
+    The stock StreamHandler flushes after every record, defeating the 8KB
+    buffer on the underlying file object; this one only flushes on close.
+    """
+
+    def flush(self):
+        pass
+
+    def close(self):
+        logging.StreamHandler.flush(self)
+        logging.StreamHandler.close(self)
+
+
+@dataclass(frozen=True)
+class Paths:
+    """Resolved filesystem paths, computed once per run"""
+    target_dwg: str
+    comparison_dir: str
+    curr_gdb: str
+    prev_gdb: str
+    log_dir: str
+    sde_table: str
+    merchav_gdb: str
+    export_gdb: str
 
-    j['rings'] = [strip_zm_coords(r) for r in j['rings']]
-   
-    return arcpy.AsShape(j, True)
 
 class PostgresToDWGConverter:
     def __init__(self):
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
+        # Single source of truth for the run's paths - computed once
+        # instead of re-joining config constants at every call site
+        comparison_dir = os.path.join(TARGET_PATH, COMPARISON_GDB)
+        self.paths = Paths(
+            target_dwg=os.path.join(TARGET_PATH, DWG_FILE_NAME),
+            comparison_dir=comparison_dir,
+            curr_gdb=os.path.join(comparison_dir, f"{TABLE_SOURCE}_curr.gdb"),
+            prev_gdb=os.path.join(comparison_dir, f"{TABLE_SOURCE}_prev.gdb"),
+            log_dir=LOG_PATH,
+            sde_table=os.path.join(SDE_PATH, TABLE_SOURCE),
+            merchav_gdb=os.path.join(comparison_dir, "temp_with_merchav.gdb"),
+            export_gdb=os.path.join(comparison_dir, "temp_dwg_export.gdb"),
+        )
         self.changes_found = False
         self.update_details = []
-        
+        # Memoized ListFields results, keyed on the dataset path - each
+        # enumeration is a metadata round-trip to SDE / the DWG driver
+        self._field_cache = {}
+        # Background worker for post-run housekeeping (GDB compression)
+        # so the caller's wall-clock time doesn't pay for disk IO
+        self._bg = ThreadPoolExecutor(max_workers=1, thread_name_prefix="housekeeping")
+
+    def __getattr__(self, name):
+        # Managers are constructed on first touch (PEP 562 style), so
+        # short-circuit paths - fingerprint says "no changes", or a pure
+        # notification - never import the modules they don't use. Together
+        # with the lazy arcpy proxy, a no-op run skips the multi-second
+        # arcpy import entirely
+        if name == "db_manager":
+            from db_utils import DatabaseManager
+            self.db_manager = DatabaseManager()
+        elif name == "gdb_manager":
+            from gdb_utils import GDBManager
+            self.gdb_manager = GDBManager()
+        elif name == "dwg_manager":
+            from dwg_utils import DWGManager
+            self.dwg_manager = DWGManager()
+        elif name == "comparison_manager":
+            from comparison_utils import ComparisonManager
+            self.comparison_manager = ComparisonManager()
+        elif name == "email_notifier":
+            from email_utils import EmailNotifier
+            self.email_notifier = EmailNotifier()
+        else:
+            raise AttributeError(name)
+        return getattr(self, name)
+
     def setup_logging(self):
         """Setup logging configuration"""
-        # Create log directory if it doesn't exist
-        os.makedirs(LOG_PATH, exist_ok=True)
-        
-        # Create log filename with timestamp
+        # Create log filename with timestamp (LOG_PATH exists; created at
+        # import time)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_filename = f"conversion_log_{timestamp}.log"
         log_filepath = os.path.join(LOG_PATH, log_filename)
         
-        # Configure logging
+        # Configure logging: the hot paths only enqueue records, a
+        # QueueListener thread does the actual file/console writes so
+        # logging never blocks the conversion on disk I/O
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+        # An explicit 8KB write buffer turns N per-record writes into one
+        # syscall per buffer fill (FileHandler flushes every record); the
+        # MemoryHandler on top batches records in 1024-record chunks
+        # before they even reach the stream (errors flush immediately)
+        log_stream = open(log_filepath, "a", buffering=8192, encoding="utf-8")
+        file_handler = _BufferedLogHandler(log_stream)
+        file_handler.setFormatter(formatter)
+        buffered_handler = logging.handlers.MemoryHandler(
+            1024, flushLevel=logging.ERROR, target=file_handler
+        )
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, buffered_handler, stream_handler,
+            respect_handler_level=True
+        )
+        self._log_listener.start()
+        # atexit runs LIFO: stop the listener (drains the queue into the
+        # buffer), close the buffer (writes to the stream), then close the
+        # stream (flushes the 8KB buffer to disk), so buffered records
+        # survive even a sys.exit(1) in main()
+        atexit.register(log_stream.close)
+        atexit.register(buffered_handler.close)
+        atexit.register(self._log_listener.stop)
+
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_filepath),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=[logging.handlers.QueueHandler(log_queue)]
         )
-        
+
         self.logger = logging.getLogger(__name__)
+        # Cache the path so notification code doesn't have to rescan LOG_PATH
+        self.log_file_path = log_filepath
         self.logger.info(f"Logging initialized. Log file: {log_filepath}")
         
     def connect_to_postgis(self):
         """Connect to PostGIS database and return feature class path"""
         try:
-            # Construct the full path to the table in SDE
-            pg_layer = f"{SDE_PATH}\\{TABLE_SOURCE}"
+            # Full path to the table in SDE, resolved once at init
+            pg_layer = self.paths.sde_table
             
             # Test if the connection works
             if not arcpy.Exists(pg_layer):
@@ -77,12 +266,37 @@ class PostgresToDWGConverter:
     def read_dwg_feature_classes(self, dwg_path):
         """Read all feature classes from DWG file and return structured data"""
         try:
-            if not os.path.exists(dwg_path):
+            try:
+                stat = os.stat(dwg_path)
+            except FileNotFoundError:
                 self.logger.info(f"DWG file not found: {dwg_path}")
                 return None
-                
+
+            # The enumeration walks the DWG's internal tables every call;
+            # the result only depends on the file, so it is cached in a
+            # sidecar keyed on mtime+size and reused while the DWG is
+            # untouched
+            cache_path = dwg_path + ".cache.json"
+            cache_key = [stat.st_mtime_ns, stat.st_size]
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("key") == cache_key:
+                    structure = cached["structure"]
+                    # Only trust caches holding absolute paths: relative
+                    # names from older caches resolve against
+                    # arcpy.env.workspace, which is not the DWG here
+                    if all(
+                        os.path.isabs(path)
+                        for path in structure.get("all_feature_classes", {}).values()
+                    ):
+                        self.logger.info("DWG unchanged - using cached structure listing")
+                        return structure
+            except (OSError, ValueError, KeyError):
+                pass
+
             self.logger.info(f"Reading DWG feature classes from: {dwg_path}")
-            
+
             # Initialize structure to hold all feature classes
             dwg_structure = {
                 'all_feature_classes': {}
@@ -94,13 +308,16 @@ class PostgresToDWGConverter:
                 feature_classes= arcpy.ListFeatureClasses()
                 self.logger.info(f"Found {len(feature_classes)} feature classes in DWG")
                 
-                for fc_path in feature_classes:
-                    fc_name = os.path.basename(fc_path)
-                    self.logger.info(f"Processing feature class: {fc_name}")
-                    
-                    # Store all feature classes
+                for fc_name in feature_classes:
+                    self.logger.info("Processing feature class: %s", fc_name)
+
+                    # Store absolute paths: ListFeatureClasses returns
+                    # workspace-relative names, which would resolve against
+                    # whatever workspace is current when the cached
+                    # structure is reused on a later run
+                    fc_path = os.path.join(dwg_path, fc_name)
                     dwg_structure['all_feature_classes'][fc_name] = fc_path
-                    
+
                     # Categorize feature classes based on naming convention
                     if 'annotation' in fc_name.lower():
                         dwg_structure['annotation'] = fc_path
@@ -123,43 +340,56 @@ class PostgresToDWGConverter:
                     dwg_structure['all_feature_classes']['main'] = dwg_path
                     dwg_structure['attribute_table'] = dwg_path
                     
-            self.logger.info(f"DWG structure: {dwg_structure}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("DWG structure: %s", dwg_structure)
+
+            try:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump({"key": cache_key, "structure": dwg_structure}, f)
+            except (OSError, TypeError) as e:
+                self.logger.warning(f"Could not cache DWG structure: {e}")
+
             return dwg_structure
             
         except Exception as e:
             self.logger.error(f"Failed to read DWG feature classes: {str(e)}")
             return None
 
-    def compare_features(self, pg_layer, dwg_structure):
-        """Compare features between PostGIS and DWG structure"""
+    def compare_features(self, pg_layer, dwg_structure, detailed=None):
+        """Compare features between PostGIS and DWG structure
+
+        When detailed is False the method returns True on the first
+        detected change instead of classifying every remaining OID - the
+        caller only branches on the boolean, so the full update_details
+        list is only worth collecting when the notification email will
+        carry it. Defaults to detailed only in production, where the
+        email is live.
+        """
         try:
+            if detailed is None:
+                detailed = ENVIRONMENT == "production"
             self.logger.info("Starting feature comparison...")
             
-            # Get field names from PostGIS layer
-            pg_fields = [field.name for field in arcpy.ListFields(pg_layer)]
-            self.logger.info(f"PostGIS fields: {pg_fields}")
-            
-            # Read PostGIS data
-            pg_features = {}
-            with arcpy.da.SearchCursor(pg_layer, ["OID@", "SHAPE@"] + pg_fields) as cursor:
-                for row in cursor:
-                    oid = row[0]
-                    geometry = row[1]
-                    attributes = row[2:]
-                    pg_features[oid] = {
-                        'geometry': geometry,
-                        'attributes': attributes,
-                        'field_names': pg_fields
-                    }
-            
-            self.logger.info(f"Found {len(pg_features)} features in PostGIS")
-            
+            # Get field names from PostGIS layer (memoized per path)
+            pg_fields = self._fields(pg_layer)
+            self.logger.info("PostGIS fields: %s", pg_fields)
+
+            # Cheap pre-check before the O(N) reads: compare row count, max
+            # OID and a pushed-down modified-since predicate against the
+            # state recorded after the last successful run. When nothing
+            # moved, the full table load is skipped entirely
+            last_run_path = self.paths.target_dwg + ".lastrun.json"
+            if dwg_structure is not None and self._pg_unchanged_since(pg_layer, pg_fields, last_run_path):
+                self.logger.info("PostGIS table unchanged since last run - skipping full comparison")
+                self.changes_found = False
+                return False
+
             if dwg_structure is None:
                 self.logger.info("No DWG file found - will create new one")
                 self.changes_found = True
                 self.update_details.append("No existing DWG file found")
                 return True
-            
+
             # Get the attribute table from DWG structure
             dwg_attribute_table = dwg_structure.get('all_feature_classes').get('gis_nafot_GIS_NAFOT')
             if not dwg_attribute_table:
@@ -168,30 +398,67 @@ class PostgresToDWGConverter:
                 self.update_details.append("No attribute table found in DWG")
                 return True
             
-            # Read DWG attribute data
-            dwg_features = {}
+            # The structure stores absolute paths, usable as-is
+            dwg_attribute_table_path = dwg_attribute_table
             try:
-                dwg_attribute_table_path = os.path.join(TARGET_PATH, DWG_FILE_NAME, dwg_attribute_table)
-                dwg_fields = [f.name for f in arcpy.ListFields(dwg_attribute_table_path)]
-                print(dwg_fields)
-                # fields = [f for f in (["OID@"] + pg_fields) if f not in ['globalid', 'objectid', 'st_area(shape)', 'st_length(shape)']]
-                with arcpy.da.SearchCursor(dwg_attribute_table_path,dwg_fields) as cursor:
-                    for row in cursor:
-                        oid = row[-1]
-                        attributes = row[1:]
-                        dwg_features[oid] = {
-                            'attributes': attributes
-                        }
+                dwg_fields = self._dwg_fields_cached(dwg_attribute_table_path)
             except Exception as e:
                 self.logger.warning(f"Could not read DWG attribute table: {str(e)}")
                 self.changes_found = True
                 self.update_details.append("Could not read DWG attribute table")
                 return True
-            
-            self.logger.info(f"Found {len(dwg_features)} features in DWG attribute table")
-            
+            self.logger.info("DWG fields: %s", dwg_fields)
+
+            changes_found = False
+            columns_filter = frozenset(COLUMNS_FILTER)
+
+            # Membership and attribute diff: try the vectorized numpy path
+            # first (two bulk reads, column-wise C-level compares); fall
+            # back to the row-wise cursor diff for tables it can't load
+            attr_details = None
+            try:
+                attr_details = self._diff_attributes_numpy(
+                    pg_layer, dwg_attribute_table_path, pg_fields, dwg_fields, columns_filter
+                )
+            except Exception as e:
+                self.logger.warning(f"numpy attribute diff unavailable, using cursor diff: {e}")
+
+            if attr_details is not None:
+                if attr_details and not detailed:
+                    self.changes_found = True
+                    self.update_details.append(attr_details[0])
+                    self.logger.info("Change detected (%s) - skipping detailed comparison",
+                                     attr_details[0])
+                    return True
+                for detail in attr_details:
+                    changes_found = True
+                    self.update_details.append(detail)
+                    self.logger.info("%s", detail)
+            else:
+                # Cursor fallback: the SDE read and the local DWG read are
+                # independent and I/O-bound (arcpy releases the GIL during
+                # database I/O), so they run concurrently - wall time is
+                # max() of the two instead of the sum
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    pg_future = executor.submit(self._read_pg_attrs, pg_layer, pg_fields)
+                    dwg_future = executor.submit(
+                        self._read_dwg_attrs, dwg_attribute_table_path, dwg_fields
+                    )
+                    pg_features = pg_future.result()
+                    try:
+                        dwg_features = dwg_future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Could not read DWG attribute table: {str(e)}")
+                        self.changes_found = True
+                        self.update_details.append("Could not read DWG attribute table")
+                        return True
+
+                self.logger.info(f"Found {len(pg_features)} features in PostGIS")
+                self.logger.info(f"Found {len(dwg_features)} features in DWG attribute table")
+
             # Get geometry from polygon feature class if available
             dwg_geometries = {}
+            dwg_wkb = {}
             dwg_attribute_table = dwg_structure.get('all_feature_classes').get('gis_nafot_GIS_NAFOT')
             polygon_fc = dwg_structure.get('all_feature_classes').get('polygon')
             if dwg_attribute_table and arcpy.Exists(dwg_attribute_table):
@@ -201,54 +468,109 @@ class PostgresToDWGConverter:
                             oid = row[2]
                             geometry = row[1]
                             dwg_geometries[oid] = geometry
+                            try:
+                                dwg_wkb[oid] = _geom_key(geometry)
+                            except Exception:
+                                dwg_wkb[oid] = None
                     self.logger.info(f"Found {len(dwg_geometries)} geometries in DWG polygon feature class")
                 except Exception as e:
                     self.logger.warning(f"Could not read DWG geometries: {str(e)}")
             
-            # Compare features
-            changes_found = False
-            
-            # Check for new features in PostGIS
-            for oid in pg_features:
-                if oid not in dwg_features:
-                    changes_found = True
-                    self.update_details.append(f"New feature found: OID {oid}")
-                    self.logger.info(f"New feature found: OID {oid}")
-                    
-            # Check for removed features
-            for oid in dwg_features:
-                if oid not in pg_features:
+            # Cursor fallback for membership + attribute diffs (the numpy
+            # path already covered these when attr_details is not None)
+            if attr_details is None:
+                # Boolean-only mode: any membership difference settles it
+                if not detailed and pg_features.keys() != dwg_features.keys():
+                    self.changes_found = True
+                    self.update_details.append("Feature membership changed")
+                    self.logger.info("Feature membership changed - skipping detailed comparison")
+                    return True
+
+                # New/removed features via set differences on the key
+                # views - one batched details extend and one summary log
+                # line instead of a logger call per OID
+                new_oids = pg_features.keys() - dwg_features.keys()
+                removed_oids = dwg_features.keys() - pg_features.keys()
+                if new_oids or removed_oids:
                     changes_found = True
-                    self.update_details.append(f"Feature removed: OID {oid}")
-                    self.logger.info(f"Feature removed: OID {oid}")
-                    
-            # Check for modified features
-            for oid in pg_features:
-                if oid in dwg_features:
-                    pg_feature = pg_features[oid]
-                    dwg_feature = dwg_features[oid]
-                    
-                    # Compare geometry if available in DWG
-                    if oid in dwg_geometries:
-                        if not (_to_2d(pg_feature['geometry'])).equals((_to_2d(dwg_geometries[oid]))):
+                    self.update_details.extend(f"New feature found: OID {oid}" for oid in new_oids)
+                    self.update_details.extend(f"Feature removed: OID {oid}" for oid in removed_oids)
+                    self.logger.info("%d new and %d removed features", len(new_oids), len(removed_oids))
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("New OIDs: %s, removed OIDs: %s",
+                                          sorted(new_oids), sorted(removed_oids))
+
+                # Precompute the field alignment once: a name->index map and
+                # (pg index, dwg index) pairs for the filtered fields, instead
+                # of an O(F) list.index per field per row. Fields missing from
+                # the DWG are reported once, not per OID
+                dwg_idx = {name: i for i, name in enumerate(dwg_fields)}
+                filter_pairs = []
+                for pi, field_name in enumerate(pg_fields):
+                    if field_name not in columns_filter:
+                        continue
+                    if field_name not in dwg_idx:
+                        changes_found = True
+                        self.update_details.append(f"field_name '{field_name}' not exists in dwg")
+                        self.logger.info("field_name '%s' not exists in dwg", field_name)
+                    else:
+                        filter_pairs.append((field_name, pi, dwg_idx[field_name] - 1))
+
+                # Compare attributes via the precomputed index pairs -
+                # one tuple index compare per filtered field
+                for oid in pg_features:
+                    if oid in dwg_features:
+                        pg_attrs = pg_features[oid]['attributes']
+                        dwg_attrs = dwg_features[oid]['attributes']
+                        for field_name, pi, di in filter_pairs:
+                            if pg_attrs[pi] != dwg_attrs[di]:
+                                changes_found = True
+                                self.update_details.append(f"Attribute '{field_name}' changed for OID {oid}")
+                                self.logger.info("Attribute '%s' changed for OID %s", field_name, oid)
+                                if not detailed:
+                                    self.changes_found = True
+                                    return True
+
+            # Geometry diff, shared by both paths. The PostGIS geometries
+            # are read lazily here - a second cursor restricted to the
+            # OIDs present in the DWG, with only OID@/SHAPE@ requested -
+            # so the attribute passes above never pay for per-row geometry
+            # deserialization. One bytes comparison of the XY WKB per
+            # common OID, with the topological test as fallback for
+            # geometries the WKB packer couldn't handle
+            # Rows with NULL Oid_1 produce an empty clause - nothing to
+            # compare against in PostGIS, so the pass is skipped
+            where = (
+                _oid_where_clause(arcpy.Describe(pg_layer).OIDFieldName, dwg_geometries)
+                if dwg_geometries else ""
+            )
+            if where:
+                to_2d_cache = {}
+                with arcpy.da.SearchCursor(pg_layer, ["OID@", "SHAPE@"], where_clause=where) as cursor:
+                    for oid, pg_geometry in cursor:
+                        dwg_geometry = dwg_geometries.get(oid)
+                        if dwg_geometry is None:
+                            continue
+                        try:
+                            geometry_changed = _geom_key(pg_geometry) != dwg_wkb[oid] \
+                                if dwg_wkb.get(oid) is not None else None
+                        except Exception:
+                            geometry_changed = None
+                        if geometry_changed is None:
+                            # Cache only the DWG side: those geometries are
+                            # pinned by dwg_geometries for the whole loop,
+                            # while the PG cursor row dies each iteration
+                            # and a recycled id() would alias rows
+                            geometry_changed = not _to_2d(pg_geometry).equals(
+                                _to_2d(dwg_geometry, to_2d_cache))
+                        if geometry_changed:
                             changes_found = True
                             self.update_details.append(f"Geometry changed for OID {oid}")
-                            self.logger.info(f"Geometry changed for OID {oid}")
-                    
-                    # Compare attributes (excluding filtered columns)
-                    for i, field_name in enumerate(pg_feature['field_names']):
-                        if field_name in COLUMNS_FILTER:
-                            if field_name not in dwg_fields:
-                                changes_found = True
-                                self.update_details.append(f"field_name '{field_name}' not exists in dwg")
-                                self.logger.info(f"field_name '{field_name}' not exists in dwg")
-                            else:
-                                i_for_dwg = dwg_fields.index(field_name)
-                                if pg_feature['attributes'][i] != dwg_feature['attributes'][i_for_dwg - 1]:
-                                    changes_found = True
-                                    self.update_details.append(f"Attribute '{field_name}' changed for OID {oid}")
-                                    self.logger.info(f"Attribute '{field_name}' changed for OID {oid}")
-                                
+                            self.logger.info("Geometry changed for OID %s", oid)
+                            if not detailed:
+                                self.changes_found = True
+                                return True
+
             self.changes_found = changes_found
             self.logger.info(f"Comparison complete. Changes found: {changes_found}")
             return changes_found
@@ -256,7 +578,239 @@ class PostgresToDWGConverter:
         except Exception as e:
             self.logger.error(f"Error during feature comparison: {str(e)}")
             raise
-            
+
+    def _read_pg_attrs(self, pg_layer, pg_fields):
+        """
+        Read the PostGIS attributes into an OID-keyed dict (no geometry)
+
+        Args:
+            pg_layer (str): Path to the PostGIS feature class
+            pg_fields (list): Field names to read
+
+        Returns:
+            dict: OID -> {'attributes': tuple}
+        """
+        pg_features = {}
+        with arcpy.da.SearchCursor(pg_layer, ["OID@"] + pg_fields) as cursor:
+            for row in cursor:
+                pg_features[row[0]] = {'attributes': row[1:]}
+        return pg_features
+
+    def _read_dwg_attrs(self, table_path, dwg_fields):
+        """
+        Read the DWG attribute table keyed by its source-OID column
+
+        Args:
+            table_path (str): Path to the table inside the DWG
+            dwg_fields (list): Field names to read (last one is the key)
+
+        Returns:
+            dict: OID -> {'attributes': tuple}
+        """
+        dwg_features = {}
+        with arcpy.da.SearchCursor(table_path, dwg_fields) as cursor:
+            for row in cursor:
+                dwg_features[row[-1]] = {'attributes': row[1:]}
+        return dwg_features
+
+    def _fields(self, layer):
+        """
+        Field names for a dataset, memoized for the lifetime of the run
+
+        Args:
+            layer (str): Dataset path to enumerate
+
+        Returns:
+            list: Field names
+        """
+        cached = self._field_cache.get(layer)
+        if cached is None:
+            cached = [field.name for field in arcpy.ListFields(layer)]
+            self._field_cache[layer] = cached
+        return cached
+
+    def _dwg_fields_cached(self, table_path):
+        """
+        Field names for a DWG-internal table, cached while the DWG stands
+
+        Same sidecar pattern as the structure listing: the field list only
+        depends on the DWG file, so it is keyed on mtime+size and the
+        ListFields enumeration is skipped while the key matches.
+
+        Args:
+            table_path (str): Path to the table inside the DWG
+
+        Returns:
+            list: Field names
+        """
+        cached = None
+        try:
+            stat = os.stat(self.paths.target_dwg)
+            key = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            key = None
+
+        cache_path = self.paths.target_dwg + ".fields.json"
+        if key is not None:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("key") == key and table_path in cached.get("fields", {}):
+                    return cached["fields"][table_path]
+            except (OSError, ValueError):
+                cached = None
+
+        fields = self._fields(table_path)
+
+        if key is not None:
+            try:
+                if not cached or cached.get("key") != key:
+                    cached = {"key": key, "fields": {}}
+                cached["fields"][table_path] = fields
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(cached, f)
+            except (OSError, TypeError) as e:
+                self.logger.warning(f"Could not cache DWG fields: {e}")
+        return fields
+
+    def _pg_source_state(self, pg_layer):
+        """
+        Capture the source table's cheap change indicators in O(1) reads
+
+        Args:
+            pg_layer (str): Path to the PostGIS feature class
+
+        Returns:
+            dict: Row count, max OID and the DB-observed latest edit date
+        """
+        count = int(arcpy.management.GetCount(pg_layer)[0])
+        with arcpy.da.SearchCursor(
+            pg_layer, ["OID@"], sql_clause=(None, "ORDER BY objectid DESC")
+        ) as cursor:
+            row = next(iter(cursor), None)
+        state = {"count": count, "max_oid": row[0] if row else 0}
+
+        # The latest edit date comes from the database itself - the app
+        # server's clock can trail the editor-tracking timestamps (UTC vs
+        # local, edits landing mid-run), which would hide edits forever
+        if "last_edited_date" in self._fields(pg_layer):
+            with arcpy.da.SearchCursor(
+                pg_layer, ["last_edited_date"],
+                where_clause="last_edited_date IS NOT NULL",
+                sql_clause=(None, "ORDER BY last_edited_date DESC")
+            ) as cursor:
+                row = next(iter(cursor), None)
+            if row is not None:
+                state["max_edit"] = row[0].strftime("%Y-%m-%d %H:%M:%S.%f")
+        return state
+
+    def _pg_unchanged_since(self, pg_layer, pg_fields, last_run_path):
+        """
+        Decide from cheap indicators whether the source table changed
+
+        Compares row count and max OID against the sidecar recorded after
+        the last successful run, then probes for rows edited since that
+        run with a pushed-down where clause - three O(1)-ish round-trips
+        instead of a full table read.
+
+        Args:
+            pg_layer (str): Path to the PostGIS feature class
+            pg_fields (list): Field names of the source table
+            last_run_path (str): Path to the last-run sidecar JSON
+
+        Returns:
+            bool: True when the table is provably unchanged
+        """
+        try:
+            with open(last_run_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        try:
+            current = self._pg_source_state(pg_layer)
+            if current["count"] != state.get("count") or current["max_oid"] != state.get("max_oid"):
+                return False
+
+            if "last_edited_date" in pg_fields:
+                # Strictly newer than the DB-observed max recorded last
+                # run; sidecars without it (older runs) can't prove
+                # anything, so fall through to the full comparison
+                if not state.get("max_edit"):
+                    return False
+                where = f"last_edited_date > TIMESTAMP '{state['max_edit']}'"
+                with arcpy.da.SearchCursor(pg_layer, ["OID@"], where_clause=where) as cursor:
+                    if next(iter(cursor), None) is not None:
+                        return False
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Modified-since pre-check failed, running full comparison: {e}")
+            return False
+
+    def _save_last_run(self, pg_layer):
+        """Record the source state so the next run can pre-check cheaply"""
+        try:
+            state = self._pg_source_state(pg_layer)
+            with open(self.paths.target_dwg + ".lastrun.json", "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        except Exception as e:
+            self.logger.warning(f"Could not save last-run state: {e}")
+
+    def _diff_attributes_numpy(self, pg_layer, dwg_table_path, pg_fields, dwg_fields, columns_filter):
+        """
+        Column-wise membership and attribute diff over bulk numpy reads
+
+        Both tables land in structured arrays with one TableToNumPyArray
+        call each (no per-row Python tuple or dict), new/removed OIDs come
+        from np.setdiff1d, and each filtered column is compared with a
+        single vectorized != over the OID-aligned rows. Raises when a
+        table can't be represented; the caller falls back to the cursor
+        diff.
+
+        Args:
+            pg_layer (str): Path to the PostGIS feature class
+            dwg_table_path (str): Path to the DWG attribute table
+            pg_fields (list): PostGIS field names
+            dwg_fields (list): DWG attribute table field names
+            columns_filter (frozenset): Fields that take part in the diff
+
+        Returns:
+            list: Human-readable change descriptions
+        """
+        details = []
+        dwg_field_set = set(dwg_fields)
+        common_fields = [f for f in pg_fields if f in columns_filter and f in dwg_field_set]
+        for field_name in pg_fields:
+            if field_name in columns_filter and field_name not in dwg_field_set:
+                details.append(f"field_name '{field_name}' not exists in dwg")
+
+        pg_arr = arcpy.da.TableToNumPyArray(
+            pg_layer, ["OID@"] + common_fields, skip_nulls=False, null_value=0
+        )
+        # The DWG attribute table carries the source OID in its last field
+        dwg_key = dwg_fields[-1]
+        dwg_arr = arcpy.da.TableToNumPyArray(
+            dwg_table_path, common_fields + [dwg_key], skip_nulls=False, null_value=0
+        )
+
+        pg_oids = pg_arr["OID@"]
+        dwg_oids = dwg_arr[dwg_key]
+
+        details.extend(f"New feature found: OID {oid}" for oid in np.setdiff1d(pg_oids, dwg_oids))
+        details.extend(f"Feature removed: OID {oid}" for oid in np.setdiff1d(dwg_oids, pg_oids))
+
+        common, pg_idx, dwg_idx = np.intersect1d(pg_oids, dwg_oids, return_indices=True)
+        for field_name in common_fields:
+            mask = np.not_equal(pg_arr[field_name][pg_idx], dwg_arr[field_name][dwg_idx])
+            if not isinstance(mask, np.ndarray):
+                # Incomparable column dtypes - let the cursor diff decide
+                raise TypeError(f"Column {field_name} is not comparable across tables")
+            details.extend(
+                f"Attribute '{field_name}' changed for OID {oid}" for oid in common[mask]
+            )
+        return details
+
 #     def add_merchav_mapping(self, pg_layer):
 #         """Add merchav_string column with mapping using CalculateField"""
 #         try:
@@ -317,99 +871,69 @@ class PostgresToDWGConverter:
 #             return pg_layer
         
     def add_merchav_mapping(self, pg_layer):
-        """Add merchav_string and Oid_1 columns using CalculateField"""
+        """Add merchav_string and Oid_1 columns in one bulk ExtendTable"""
         try:
             self.logger.info("Adding merchav_string and Oid_1 columns...")
 
-            # Check if merchav column exists
-            fields = [field.name for field in arcpy.ListFields(pg_layer)]
+            # Check if merchav column exists (memoized per path)
+            fields = self._fields(pg_layer)
             if 'merchav' not in fields:
                 self.logger.warning("'merchav' column not found in source table")
                 return pg_layer
 
-            # Create a temporary feature class with the new columns
-            comparison_dir = os.path.join(TARGET_PATH, COMPARISON_GDB)
+            # Create a temporary feature class with the new columns; the
+            # paths were resolved once at init
+            comparison_dir = self.paths.comparison_dir
             os.makedirs(comparison_dir, exist_ok=True)
-            temp_gdb = os.path.join(comparison_dir, "temp_with_merchav.gdb")
+            temp_gdb = self.paths.merchav_gdb
 
-            # Delete existing GDB if it exists
-            if arcpy.Exists(temp_gdb):
+            # Remove any leftover GDB; Delete on a missing path just
+            # raises, which is cheaper than a separate Exists round-trip
+            try:
                 arcpy.management.Delete(temp_gdb)
+            except Exception:
+                pass
 
             # Create new GDB
-            arcpy.management.CreateFileGDB(comparison_dir, "temp_with_merchav.gdb")
+            arcpy.management.CreateFileGDB(comparison_dir, os.path.basename(temp_gdb))
 
             temp_fc = os.path.join(temp_gdb, "temp_layer")
 
             # Copy the original layer
             arcpy.management.CopyFeatures(pg_layer, temp_fc)
 
-            # Add the new fields
-            arcpy.management.AddField(temp_fc, "merchav_string", "TEXT", field_length=50)
-            arcpy.management.AddField(temp_fc, "Oid_1", "LONG")
-
-            # Build a code block with the mapping logic
-            code_block = f"""
-def get_merchav_string(merchav):
-    mapping = {merchav_MAPPING}
-    if merchav in mapping:
-        return mapping[merchav]
-    elif merchav is not None:
-        return f'Unknown_{{merchav}}'
-    else:
-        return None
-"""
-
-            # Calculate merchav_string field
-            arcpy.management.CalculateField(
-                in_table=temp_fc,
-                field="merchav_string",
-                expression="get_merchav_string(!merchav!)",
-                expression_type="PYTHON3",
-                code_block=code_block
+            # Derive merchav_string in one in-memory pass: read the codes
+            # as an array, map them through the dict, and attach the new
+            # column with ExtendTable - instead of CalculateField invoking
+            # the interpreter (and re-parsing the mapping) once per row.
+            # Oid_1 rides along in the same call: CopyFeatures preserves
+            # row order, so the source OIDs pair positionally with the
+            # copy's OIDs - one bulk attach creates and fills both fields
+            arr = arcpy.da.TableToNumPyArray(temp_fc, ["OID@", "merchav"], skip_nulls=False, null_value=-1)
+            merchav_strings = np.array(
+                [
+                    merchav_MAPPING.get(code, "" if code == -1 else f"Unknown_{code}")
+                    for code in arr["merchav"]
+                ],
+                dtype="<U50"
+            )
+            src_oids = [
+                row[0] for row in arcpy.da.SearchCursor(
+                    pg_layer, [arcpy.Describe(pg_layer).OIDFieldName]
+                )
+            ]
+            extension = np.empty(
+                len(arr),
+                dtype=[("copy_oid", np.int64), ("merchav_string", "<U50"), ("Oid_1", np.int64)]
+            )
+            extension["copy_oid"] = arr["OID@"]
+            extension["merchav_string"] = merchav_strings
+            extension["Oid_1"] = src_oids
+            arcpy.da.ExtendTable(
+                temp_fc, arcpy.Describe(temp_fc).OIDFieldName, extension, "copy_oid"
             )
-
-            # Calculate Oid_1 field with the original OID
-            # oid_field = arcpy.Describe(pg_layer).OIDFieldName
-            # arcpy.management.CalculateField(
-            #     in_table=temp_fc,
-            #     field="Oid_1",
-            #     expression=f"!{oid_field}!",
-            #     expression_type="PYTHON3"
-            # )
-
-            
-            # Get original OID values
-            original_oid_field = arcpy.Describe(pg_layer).OIDFieldName
-            original_oid_map = {}
-
-            with arcpy.da.SearchCursor(pg_layer, ["SHAPE@", original_oid_field]) as cursor:
-                for row in cursor:
-                    original_oid_map[row[0].WKT] = row[1]  # Using WKT as a simple geometry key
-
 
             
-            workspace = temp_gdb  # The GDB where temp_layer resides
-            editor = arcpy.da.Editor(workspace)
-
-            # Start edit session and operation
-            editor.startEditing(False, True)
-            editor.startOperation()
-
-            try:
-                # Update the copied layer
-                with arcpy.da.UpdateCursor(temp_fc, ["SHAPE@", "Oid_1"]) as cursor:
-                    for row in cursor:
-                        geom_wkt = row[0].WKT
-                        if geom_wkt in original_oid_map:
-                            row[1] = original_oid_map[geom_wkt]
-                            cursor.updateRow(row)
-            finally:   
-            # Stop operation and edit session
-                editor.stopOperation()
-                editor.stopEditing(True)
-
-
 
             self.logger.info("Successfully added merchav_string and Oid_1 columns")
             return temp_fc
@@ -418,8 +942,18 @@ def get_merchav_string(merchav):
             self.logger.error(f"Error adding merchav mapping and OID_1: {str(e)}")
             return pg_layer
             
-    def export_to_dwg(self, source_layer, output_path):
-        """Export feature class to DWG format with proper feature class structure"""
+    def export_to_dwg(self, source_layer, output_path, include_polylines=False):
+        """
+        Export feature class to DWG format with proper feature class structure
+
+        Args:
+            source_layer (str): Feature class or layer to export
+            output_path (str): Full path of the DWG file to write
+            include_polylines (bool): Also build the polyline boundary FC
+                and the empty annotation/multipatch FCs. Only the attribute
+                FC is exported, so these are skipped by default -
+                FeatureToLine is a full topological pass over every polygon
+        """
         try:
             self.logger.info(f"Exporting to DWG with proper structure: {output_path}")
             
@@ -427,59 +961,50 @@ def get_merchav_string(merchav):
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
             # Create a temporary GDB to prepare the data with proper structure
-            # Use TARGET_PATH + COMPARISON_GDB instead of scratch
-            comparison_dir = os.path.join(TARGET_PATH, COMPARISON_GDB)
+            # Use TARGET_PATH + COMPARISON_GDB instead of scratch; the
+            # paths were resolved once at init
+            comparison_dir = self.paths.comparison_dir
             os.makedirs(comparison_dir, exist_ok=True)
-            
-            temp_gdb_name = "temp_dwg_export"
-            temp_gdb = os.path.join(comparison_dir, f"{temp_gdb_name}.gdb")
-            
-            # Delete existing GDB if it exists
-            if arcpy.Exists(temp_gdb):
+            temp_gdb = self.paths.export_gdb
+
+            # Remove any leftover GDB; Delete on a missing path just
+            # raises, which is cheaper than a separate Exists round-trip
+            try:
                 arcpy.management.Delete(temp_gdb)
-            
+            except Exception:
+                pass
+
             # Create new GDB
-            arcpy.management.CreateFileGDB(comparison_dir, f"{temp_gdb_name}.gdb")
-            
-            # Copy source layer to temp GDB
-            temp_fc = os.path.join(temp_gdb, TABLE_SOURCE)
-            arcpy.management.CopyFeatures(source_layer, temp_fc)
+            arcpy.management.CreateFileGDB(comparison_dir, os.path.basename(temp_gdb))
             
-            # Create separate feature classes for different geometry types
-            # This ensures the DWG will have the proper structure
-            
-            # 1. Create the main polygon feature class (primary geometry)
-            polygon_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_Polygon")
-            arcpy.management.CopyFeatures(temp_fc, polygon_fc)
-            
-            # 2. Create polyline feature class (extract boundaries)
-            polyline_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_Polyline")
-            try:
-                # Convert polygon boundaries to polylines
-                arcpy.management.FeatureToLine(polygon_fc, polyline_fc)
-            except Exception as e:
-                self.logger.warning(f"Could not create polyline feature class: {str(e)}")
-                # Create empty polyline feature class
-                arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Polyline", "POLYLINE")
-            
-            # 3. Create annotation feature class (empty for now)
-            annotation_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_Annotation")
-            arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Annotation", "POINT")
-            
-            # 4. Create multipatch feature class (empty for now)
-            multipatch_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_Multipatch")
-            arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Multipatch", "MULTIPATCH")
-            
-            # 5. Create the attribute table (copy of original with all attributes)
+            # Single copy of the source into the FC that ExportCAD reads;
+            # the old source->temp->polygon/attribute chain cloned the
+            # same dataset three times into the same GDB
             attribute_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_GIS_NAFOT")
-            arcpy.management.CopyFeatures(temp_fc, attribute_fc)
-            
+            arcpy.management.CopyFeatures(source_layer, attribute_fc)
+
+            # Only the attribute FC is exported below, so the polyline
+            # boundary extraction and the empty annotation/multipatch FCs
+            # are dead work unless explicitly requested
+            if include_polylines:
+                # Create polyline feature class (extract boundaries)
+                polyline_fc = os.path.join(temp_gdb, f"{TABLE_SOURCE}_Polyline")
+                try:
+                    # Convert polygon boundaries to polylines
+                    arcpy.management.FeatureToLine(attribute_fc, polyline_fc)
+                except Exception as e:
+                    self.logger.warning(f"Could not create polyline feature class: {str(e)}")
+                    # Create empty polyline feature class
+                    arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Polyline", "POLYLINE")
+
+                # Create annotation feature class (empty for now)
+                arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Annotation", "POINT")
+
+                # Create multipatch feature class (empty for now)
+                arcpy.management.CreateFeatureclass(temp_gdb, f"{TABLE_SOURCE}_Multipatch", "MULTIPATCH")
+
             # Export all feature classes to DWG
             feature_classes_to_export = [
-                # polygon_fc,
-                # polyline_fc,
-                # annotation_fc,
-                # multipatch_fc,
                 attribute_fc
             ]
             
@@ -511,6 +1036,311 @@ def get_merchav_string(merchav):
             self.logger.error(f"Error exporting to DWG: {str(e)}")
             raise
 
+    def create_initial_dwg(self):
+        """Create the first DWG through the GDB pipeline (no previous DWG)"""
+        try:
+            self.logger.info("Creating initial DWG via GDB pipeline...")
+
+            curr_gdb_path = self.paths.curr_gdb
+            target_dwg_path = self.paths.target_dwg
+
+            # Opt-in fast path: stream PG straight to DWG with ogr2ogr,
+            # skipping the intermediate GDB and the arcpy enrichment
+            if os.getenv("FAST_INITIAL") and PG_DSN:
+                try:
+                    self.dwg_manager.direct_pg_to_dwg(
+                        PG_DSN, TABLE_SOURCE, merchav_MAPPING, target_dwg_path
+                    )
+                    self.logger.info(f"Initial DWG created via direct export: {target_dwg_path}")
+                    return
+                except Exception as direct_error:
+                    self.logger.warning(
+                        f"Direct PG to DWG export failed, using GDB pipeline: {direct_error}"
+                    )
+
+            # Checkpointed steps: a crash mid-pipeline resumes where it
+            # stopped instead of re-exporting from scratch
+            self._step("export", self.db_manager.export_table_to_gdb, curr_gdb_path, TABLE_SOURCE)
+            self._step(
+                "enrich",
+                self.gdb_manager.add_merchav_string_column,
+                curr_gdb_path, TABLE_SOURCE, merchav_MAPPING
+            )
+            self.dwg_manager.convert_gdb_to_dwg(curr_gdb_path, TABLE_SOURCE, target_dwg_path)
+            self._clear_step_markers()
+
+            # Keep the GDB for investigation (compressed in the background)
+            self._archive_gdb(curr_gdb_path)
+            self.logger.info(f"Initial DWG created: {target_dwg_path}")
+
+        except Exception as e:
+            self.logger.error(f"Error creating initial DWG: {str(e)}")
+            raise
+
+    def _query_change_fingerprint(self):
+        """
+        Query a cheap change fingerprint for TABLE_SOURCE
+
+        One aggregate round-trip (count, max OID, md5 of the OID list)
+        stands in for the full export+compare when nothing changed.
+
+        Returns:
+            list: [row_count, max_oid, oid_digest], or None when no direct
+            DSN is configured or the query fails
+        """
+        if not PG_DSN:
+            return None
+        try:
+            import psycopg2
+            with psycopg2.connect(PG_DSN) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        f"SELECT count(*), coalesce(max(objectid), 0), "
+                        f"md5(coalesce(string_agg(objectid::text, ',' ORDER BY objectid), '')) "
+                        f"FROM {TABLE_SOURCE}"
+                    )
+                    return list(cursor.fetchone())
+        except Exception as e:
+            self.logger.warning(f"Could not query change fingerprint: {e}")
+            return None
+
+    def _load_fingerprint(self, fingerprint_path):
+        """Load the saved fingerprint from disk, or None if missing/corrupt"""
+        try:
+            with open(fingerprint_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_fingerprint(self, fingerprint_path, fingerprint):
+        """Persist the fingerprint next to the DWG"""
+        try:
+            with open(fingerprint_path, "w", encoding="utf-8") as f:
+                json.dump(fingerprint, f)
+        except OSError as e:
+            self.logger.warning(f"Could not save fingerprint: {e}")
+
+    def _step(self, name, fn, *args, **kwargs):
+        """
+        Run a pipeline step unless its checkpoint marker says it's done
+
+        A crash mid-pipeline no longer throws away finished work: the
+        re-run skips every step whose marker exists. Markers live in the
+        comparison directory and are cleared when the source data changes
+        or when the run completes.
+
+        Args:
+            name (str): Step name, used for the marker filename
+            fn (callable): The step implementation
+        """
+        marker = os.path.join(self.paths.comparison_dir, f".{name}.done")
+        if os.path.exists(marker):
+            self.logger.info("Step '%s' already completed - skipping", name)
+            return
+        fn(*args, **kwargs)
+        os.makedirs(self.paths.comparison_dir, exist_ok=True)
+        with open(marker, "wb"):
+            pass
+
+    def _step_done(self, name):
+        """Check whether a step's checkpoint marker exists"""
+        return os.path.exists(os.path.join(self.paths.comparison_dir, f".{name}.done"))
+
+    def _clear_step_markers(self):
+        """Remove all step checkpoint markers before a fresh run"""
+        try:
+            for entry in os.scandir(self.paths.comparison_dir):
+                if entry.name.startswith(".") and entry.name.endswith(".done"):
+                    os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+
+    def perform_comparison_and_update(self):
+        """Compare the current data against the previous DWG and update it"""
+        try:
+            self.logger.info("Starting comparison and update via GDB pipeline...")
+
+            curr_gdb_path = self.paths.curr_gdb
+            prev_gdb_path = self.paths.prev_gdb
+            target_dwg_path = self.paths.target_dwg
+
+            # Fast pre-check: one aggregate query against PostgreSQL decides
+            # whether the expensive export/reflect/compare cycle is needed
+            fingerprint_path = target_dwg_path + ".fp"
+            fingerprint = self._query_change_fingerprint()
+            if fingerprint is not None and fingerprint == self._load_fingerprint(fingerprint_path):
+                self.logger.info("No changes detected via fingerprint - skipping comparison")
+                return
+
+            # Checkpoint markers from a crashed run are only trusted when
+            # the source data hasn't moved since they were written;
+            # otherwise this is a fresh run and they are cleared
+            steps_fp_path = os.path.join(self.paths.comparison_dir, ".steps.fp")
+            if fingerprint is None or fingerprint != self._load_fingerprint(steps_fp_path):
+                self._clear_step_markers()
+                if fingerprint is not None:
+                    os.makedirs(self.paths.comparison_dir, exist_ok=True)
+                    self._save_fingerprint(steps_fp_path, fingerprint)
+
+            # Clean up GDBs left over from the previous run. One scandir of
+            # the comparison dir replaces a stat per GDB (a round-trip each
+            # on network storage); the two independent deletes then run in
+            # parallel since they are dominated by small-file unlinks
+            try:
+                existing = {entry.name for entry in os.scandir(self.paths.comparison_dir)}
+            except FileNotFoundError:
+                existing = set()
+
+            # GDBs produced by an already-checkpointed step are kept so the
+            # resumed run can reuse them
+            leftover_gdbs = [
+                path for path, step in [(curr_gdb_path, "export"), (prev_gdb_path, "reflect")]
+                if os.path.basename(path) in existing and not self._step_done(step)
+            ]
+            if leftover_gdbs:
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    list(executor.map(self.gdb_manager.delete_gdb, leftover_gdbs))
+
+            # The current-data export and the previous-DWG reflection are
+            # independent (different inputs and outputs), so run them
+            # concurrently - wall time is max() of the two instead of the sum
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                export_future = executor.submit(
+                    self._step, "export",
+                    self.db_manager.export_table_to_gdb, curr_gdb_path, TABLE_SOURCE
+                )
+                reflect_future = executor.submit(
+                    self._step, "reflect",
+                    self.dwg_manager.convert_dwg_to_gdb, target_dwg_path, prev_gdb_path, TABLE_SOURCE
+                )
+                export_future.result()
+                reflect_future.result()
+
+            # Enrichment depends on the finished export
+            self._step(
+                "enrich",
+                self.gdb_manager.add_merchav_string_column,
+                curr_gdb_path, TABLE_SOURCE, merchav_MAPPING
+            )
+
+            # Stream the hash-based row diff: deciding "anything changed?"
+            # costs one item, and only a bounded sample is materialized for
+            # the notification details
+            updates_iter = self.comparison_manager.iter_row_changes(
+                curr_gdb_path, prev_gdb_path, TABLE_SOURCE
+            )
+            first_change = next(updates_iter, None)
+            if first_change is not None:
+                sample = list(itertools.islice(
+                    itertools.chain([first_change], updates_iter), 50
+                ))
+                self.logger.info("Updates found (first %d shown): %s", len(sample), sample)
+                self.update_details.extend(f"{op}: OID {oid}" for op, oid in sample)
+                self.dwg_manager.convert_gdb_to_dwg(curr_gdb_path, TABLE_SOURCE, target_dwg_path)
+                self.changes_found = True
+            else:
+                self.logger.info("No updates found - DWG left unchanged")
+
+            # Only mark this state as seen once the DWG matches the data,
+            # and drop the checkpoints - the run completed
+            if fingerprint is not None:
+                self._save_fingerprint(fingerprint_path, fingerprint)
+            self._clear_step_markers()
+
+            # Keep GDBs for investigation (compressed in the background)
+            self._archive_gdb(curr_gdb_path)
+            self._archive_gdb(prev_gdb_path)
+
+        except Exception as e:
+            self.logger.error(f"Error during comparison and update: {str(e)}")
+            raise
+
+    def _archive_gdb(self, gdb_path):
+        """
+        Zip a kept-for-investigation GDB on the background worker
+
+        The multi-hundred-MB GDB directories stay available as zip
+        archives without the run waiting for the compression IO.
+
+        Args:
+            gdb_path (str): Path to the .gdb folder to archive
+        """
+        if not os.path.isdir(gdb_path):
+            return
+        self._bg.submit(
+            shutil.make_archive,
+            gdb_path,
+            "zip",
+            root_dir=os.path.dirname(gdb_path),
+            base_dir=os.path.basename(gdb_path),
+        )
+        self.logger.info("Archiving %s in the background", gdb_path)
+
+    def _enriched_view_layer(self):
+        """
+        Resolve the database-side enriched view when one is configured
+
+        The view carries merchav_string and oid_1 as SQL-derived columns,
+        replacing the whole copy + AddField + per-row calculate pipeline
+        with zero client-side work. Missing views are created once through
+        the SDE connection.
+
+        Returns:
+            str: Path to the view in SDE, or None when not configured or
+            unavailable
+        """
+        if not ENRICHED_VIEW:
+            return None
+        try:
+            view_layer = os.path.join(SDE_PATH, ENRICHED_VIEW)
+            if not arcpy.Exists(view_layer):
+                self._create_enriched_view()
+            if arcpy.Exists(view_layer):
+                self.logger.info(f"Using enriched view: {view_layer}")
+                return view_layer
+            return None
+        except Exception as e:
+            self.logger.warning(f"Enriched view unavailable, enriching client-side: {e}")
+            return None
+
+    def _create_enriched_view(self):
+        """Create the enriched view in PostgreSQL through the SDE connection"""
+        from dwg_utils import _merchav_case_sql
+
+        case_sql = _merchav_case_sql(merchav_MAPPING)
+        sql = (
+            f"CREATE OR REPLACE VIEW {ENRICHED_VIEW} AS "
+            f"SELECT *, {case_sql} AS merchav_string, objectid AS oid_1 "
+            f"FROM {TABLE_SOURCE}"
+        )
+        executor = arcpy.ArcSDESQLExecute(SDE_PATH)
+        executor.execute(sql)
+        self.logger.info(f"Created enriched view {ENRICHED_VIEW}")
+
+    def send_notification(self, subject, body):
+        """Send a notification email referencing this run's log file"""
+        try:
+            log_filepath = getattr(self, 'log_file_path', None)
+            if log_filepath is None or not os.path.exists(log_filepath):
+                # Fallback: one scandir pass (stat info comes with each
+                # entry) instead of listdir + getctime per file
+                log_entries = [
+                    entry for entry in os.scandir(self.paths.log_dir)
+                    if entry.name.endswith(".log")
+                ]
+                if log_entries:
+                    log_filepath = max(log_entries, key=lambda e: e.stat().st_ctime).path
+
+            message = body
+            if log_filepath:
+                message = f"{body}\n\nLog file: {log_filepath}"
+
+            self.email_notifier.send_email(EMAIL_GROUP, subject, message)
+
+        except Exception as e:
+            # Notification failures must not stop the conversion
+            self.logger.error(f"Error sending notification: {str(e)}")
+
     def run_conversion(self):
         """Main conversion process"""
         try:
@@ -520,36 +1350,62 @@ def get_merchav_string(merchav):
             pg_layer = self.connect_to_postgis()
             
             # Step 2: Check if DWG file exists and read its structure
-            dwg_path = os.path.join(TARGET_PATH, DWG_FILE_NAME)
+            dwg_path = self.paths.target_dwg
             dwg_structure = self.read_dwg_feature_classes(dwg_path)
-            
-            # Step 3: Compare features
-            changes_found = self.compare_features(pg_layer, dwg_structure)
-            
-            # Step 4: If changes found or no DWG exists, create new DWG
-            if changes_found or dwg_structure is None:
-                self.logger.info("Changes detected or no existing DWG - creating new DWG file")
-                
-                # Add merchav mapping
-                enhanced_layer = self.add_merchav_mapping(pg_layer)
-                
-                # Export to DWG
-                self.export_to_dwg(enhanced_layer, dwg_path)
-                
-                # !!Send notification email ONLY if changes were found (not for first run without existing DWG)
-                # if changes_found:
-                #     self.send_notification_email()
-                # else:
-                #     self.logger.info("First run - DWG created but no email sent")
-                
+
+            if dwg_structure is None:
+                # Step 3a: First run - build the initial DWG through the
+                # checkpointed GDB pipeline (no email for the first run)
+                self.create_initial_dwg()
+                self.logger.info("First run - DWG created but no email sent")
+
+            # Step 3b: Compare features - the sidecar pre-checks and the
+            # numpy diff make the no-change verdict cheap
+            elif self.compare_features(pg_layer, dwg_structure):
+                self.logger.info("Changes detected - updating DWG file")
+
+                # Step 4: Update through the checkpointed GDB pipeline
+                # (fingerprint gate, resumable export/reflect, streamed
+                # row diff); on failure, fall back to regenerating the
+                # DWG directly from the enriched source
+                try:
+                    self.perform_comparison_and_update()
+                except Exception as pipeline_error:
+                    self.logger.warning(
+                        f"GDB update pipeline failed, regenerating DWG directly: {pipeline_error}"
+                    )
+                    # Prefer the database-side enriched view (derived
+                    # columns computed in SQL, zero row-by-row Python and
+                    # no temp GDB); fall back to client-side enrichment
+                    enhanced_layer = self._enriched_view_layer()
+                    if enhanced_layer is None:
+                        enhanced_layer = self.add_merchav_mapping(pg_layer)
+                    self.export_to_dwg(enhanced_layer, dwg_path)
+                    self.changes_found = True
+
+                # The send is a fire-and-forget enqueue on the notifier's
+                # worker thread, so the pipeline never blocks on SMTP
+                if self.changes_found:
+                    self.send_notification(
+                        "DWG updated",
+                        "Changes were detected and the DWG file was regenerated."
+                    )
+
                 self.logger.info("Conversion process completed successfully")
             else:
                 self.logger.info("No changes detected - no action needed")
-                
+
+            # Record the source state so the next run can short-circuit
+            # the full comparison with cheap count/max-OID/modified checks
+            self._save_last_run(pg_layer)
+
         except Exception as e:
             self.logger.error(f"Conversion process failed: {str(e)}")
             raise
         finally:
+            # Let queued archive jobs finish on their own thread; the
+            # process may exit while zipping continues
+            self._bg.shutdown(wait=False)
             # Cleanup temporary files
             try:
                 if 'enhanced_layer' in locals():
@@ -557,23 +1413,3 @@ def get_merchav_string(merchav):
             except:
                 pass
 
-
-def main():
-    """Main function"""
-    try:
-        # Set ArcGIS environment
-        arcpy.env.overwriteOutput = True
-        arcpy.env.workspace = arcpy.env.scratchGDB
-        
-        # Create converter instance and run
-        converter = PostgresToDWGConverter()
-        converter.run_conversion()
-        
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        sys.exit(1)
-
-
-if __name__ == "__main__":
-    main()
-